@@ -0,0 +1,203 @@
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+
+# default cache location and size limit (least recently used entries are evicted first)
+DEFAULT_CACHE_DIR = 'data/cache'
+DEFAULT_MAX_CACHE_BYTES = 1024 ** 3
+
+# parameters that do not change the conversion output (lineage is cached as a separate entry)
+IGNORED_PARAMS = ['n_jobs', 'lineage_path']
+
+def hash_file(path: str, block_size=1024 * 1024) -> str:
+    """
+    params:
+    - path: input file path
+    - block_size: number of bytes read at once (default: 1 MiB)
+    """
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def get_cache_key(converter, input_path: str, output_path: str, **params) -> str:
+    """
+    params:
+    - converter: converter function (e.g. csv_to_xes)
+    - input_path: input file path
+    - output_path: output file path (only its extension is part of the key)
+    - params: further converter parameters
+    """
+
+    # apply defaults so that omitted and explicitly passed default values share an entry
+    bound = inspect.signature(converter).bind(input_path, output_path, **params)
+    bound.apply_defaults()
+    normalized = {k: v for k, v in list(bound.arguments.items())[2:] if k not in IGNORED_PARAMS}
+
+    # each converter module bumps its CONVERTER_VERSION when its output changes
+    version = getattr(sys.modules.get(converter.__module__), 'CONVERTER_VERSION', '0')
+    key = json.dumps({
+        'input': hash_file(input_path),
+        'converter': converter.__name__,
+        'version': version,
+        'output_format': os.path.splitext(output_path)[1].lower(),
+        'params': normalized
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(key.encode()).hexdigest()
+
+def get_cache_entries(cache_dir=DEFAULT_CACHE_DIR) -> list:
+    """
+    params:
+    - cache_dir: cache directory (default: 'data/cache')
+    """
+
+    if not os.path.isdir(cache_dir):
+        return []
+    entries = []
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if os.path.isfile(path) and not name.startswith('.'):
+            stat = os.stat(path)
+            entries.append({'path': path, 'size': stat.st_size, 'last_used': stat.st_mtime})
+    return sorted(entries, key=lambda e: e['last_used'])
+
+def evict_cache(cache_dir=DEFAULT_CACHE_DIR, max_cache_bytes=DEFAULT_MAX_CACHE_BYTES) -> int:
+    """
+    params:
+    - cache_dir: cache directory (default: 'data/cache')
+    - max_cache_bytes: size limit of the cache (default: 1 GiB)
+    """
+
+    # remove least recently used entries until the cache fits into the limit
+    entries = get_cache_entries(cache_dir)
+    total = sum(e['size'] for e in entries)
+    removed = 0
+    for entry in entries:
+        if total <= max_cache_bytes:
+            break
+        os.remove(entry['path'])
+        total -= entry['size']
+        removed += 1
+    return removed
+
+def invalidate_cache(cache_dir=DEFAULT_CACHE_DIR, converter=None, max_cache_bytes=DEFAULT_MAX_CACHE_BYTES) -> int:
+    """
+    params:
+    - cache_dir: cache directory (default: 'data/cache')
+    - converter: only remove entries of this converter function (default: all entries)
+    - max_cache_bytes: size limit the remaining entries are evicted to (default: 1 GiB)
+    """
+
+    prefix = f"{converter.__name__}-" if converter is not None else ''
+    removed = 0
+    for entry in get_cache_entries(cache_dir):
+        if os.path.basename(entry['path']).startswith(prefix):
+            os.remove(entry['path'])
+            removed += 1
+    return removed + evict_cache(cache_dir, max_cache_bytes)
+
+def get_lineage_file(lineage_path: str) -> str:
+    """
+    params:
+    - lineage_path: lineage path passed to the converter
+    """
+
+    # np.savez appends the extension if it is missing
+    return lineage_path if lineage_path.endswith('.npz') else f"{lineage_path}.npz"
+
+def store_entry(path: str, cache_path: str, cache_dir: str):
+    """
+    params:
+    - path: file to store (converter output or lineage)
+    - cache_path: cache entry path
+    - cache_dir: cache directory
+    """
+
+    # written to a temporary file first so readers never see partial entries
+    tmp_path = os.path.join(cache_dir, f".{os.path.basename(cache_path)}.{os.getpid()}.tmp")
+    shutil.copyfile(path, tmp_path)
+    os.replace(tmp_path, cache_path)
+
+def place_output(cache_path: str, output_path: str, use_hardlink=False):
+    """
+    params:
+    - cache_path: cache entry path
+    - output_path: output file path
+    - use_hardlink: hardlink the entry instead of copying it, the output is read-only then (default: False)
+    """
+
+    # replace (never overwrite in place) so that a hardlinked entry is not modified
+    if os.path.lexists(output_path):
+        os.remove(output_path)
+    if use_hardlink:
+        try:
+            # a hardlinked entry shares its inode with the output: read-only, so writing to the output fails instead of corrupting the cache
+            os.chmod(cache_path, 0o444)
+            os.link(cache_path, output_path)
+            return
+        except OSError:
+            pass  # e.g. different file system
+    shutil.copyfile(cache_path, output_path)
+
+def cached_convert(converter, input_path: str, output_path: str,
+                   cache_dir=DEFAULT_CACHE_DIR,
+                   max_cache_bytes=DEFAULT_MAX_CACHE_BYTES,
+                   use_hardlink=False,
+                   **params):
+    """
+    params:
+    - converter: converter function (csv_to_xes, xes_to_ocel2, ocel2_to_xes or ocel2_to_csv)
+    - input_path: input file path
+    - output_path: output file path
+    - cache_dir: cache directory (default: 'data/cache')
+    - max_cache_bytes: size limit of the cache (default: 1 GiB)
+    - use_hardlink: hardlink cached outputs instead of copying them, the outputs are read-only then (default: False)
+    - params: further converter parameters (e.g. case_col, timestamp_format, case_object_type, lineage_path)
+    """
+
+    key = get_cache_key(converter, input_path, output_path, **params)
+    cache_path = os.path.join(cache_dir, f"{converter.__name__}-{key}{os.path.splitext(output_path)[1].lower()}")
+
+    # the lineage of an output is stored next to it, a hit needs it only if lineage is requested
+    lineage_path = params.get('lineage_path')
+    lineage_cache_path = os.path.join(cache_dir, f"{converter.__name__}-{key}.lineage.npz")
+
+    cache_hit = os.path.isfile(cache_path) and (lineage_path is None or os.path.isfile(lineage_cache_path))
+    if cache_hit:
+        os.utime(cache_path)  # mark as recently used
+        if lineage_path is not None:
+            os.utime(lineage_cache_path)
+    else:
+        if os.path.lexists(output_path):
+            os.remove(output_path)
+        converter(input_path, output_path, **params)
+
+        # store copies of the output and its lineage
+        os.makedirs(cache_dir, exist_ok=True)
+        store_entry(output_path, cache_path, cache_dir)
+        if lineage_path is not None:
+            store_entry(get_lineage_file(lineage_path), lineage_cache_path, cache_dir)
+
+    if cache_hit or not os.path.isfile(output_path):
+        place_output(cache_path, output_path, use_hardlink)
+    if lineage_path is not None and (cache_hit or not os.path.isfile(get_lineage_file(lineage_path))):
+        place_output(lineage_cache_path, get_lineage_file(lineage_path), use_hardlink)
+
+    # evicted on hits as well, e.g. after the limit was lowered (the entries just used are the most recent ones)
+    evict_cache(cache_dir, max_cache_bytes)
+
+    return {
+        'cache_hit': cache_hit,
+        'cache_key': key,
+        'output_path': output_path
+    }
+
+if __name__ == "__main__":
+    from csv_to_xes import csv_to_xes
+    result = cached_convert(csv_to_xes, 'data/sample_data/csv_sample_simple.csv', 'data/generated_data/roundtrip/xes_from_csv_simple.xes')
+    print(f"Cache-Treffer: {result['cache_hit']}")
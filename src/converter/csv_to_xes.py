@@ -1,58 +1,194 @@
+import os
+import shutil
+import tempfile
+import numpy as np
 import pandas as pd
 import pm4py
-from itertools import product
+from functools import partial
+from parallel_conversion import partition_by_case, map_partitions
+from lineage import save_lineage
+from external_sort import infer_csv_dtypes, spill_run, external_sort_to_xes
+from list_attributes import MULTI_VALUE_DELIMITER
 
-def csv_to_xes(csv_path: str, xes_path: str,
-               case_col='case_id',
-               activity_col='activity',
-               timestamp_col='timestamp',
-               resource_col='resource',
-               timestamp_format='%Y-%m-%d %H:%M:%S'):
+CONVERTER_VERSION = '1'
+
+def get_split_counts(df: pd.DataFrame, attr_cols: list) -> pd.DataFrame:
+    """
+    params:
+    - df: csv data frame (or chunk)
+    - attr_cols: potential multi-value columns
+    """
+
+    # number of values per cell, non-string cells count as a single value
+    counts = {}
+    for col in attr_cols:
+        if df[col].dtype == object:
+            counts[col] = df[col].str.count(MULTI_VALUE_DELIMITER).astype(float).fillna(0).astype(np.int64).to_numpy() + 1
+        else:
+            counts[col] = np.ones(len(df), dtype=np.int64)
+    return pd.DataFrame(counts, index=df.index, columns=attr_cols)
+
+def get_row_event_counts(df: pd.DataFrame, attr_cols: list, max_row_expansion=None) -> np.ndarray:
+    """
+    params:
+    - df: csv data frame (or chunk)
+    - attr_cols: potential multi-value columns
+    - max_row_expansion: rows creating more events than this count as one event (default: no limit)
+    """
+
+    # output events per input row without expanding anything
+    counts = get_split_counts(df, attr_cols).prod(axis=1).to_numpy()
+    if max_row_expansion is not None:
+        counts = np.where(counts > max_row_expansion, 1, counts)
+    return counts
+
+def estimate_expansion(csv_path: str,
+                       case_col='case_id',
+                       activity_col='activity',
+                       timestamp_col='timestamp',
+                       max_row_expansion=None,
+                       chunk_size=100000,
+                       dtype=None):
     """
     params:
     - csv_path: csv file path
-    - xes_path: xes output file path
     - case_col: column name for case ids (default: 'case_id')
-    - activity_col: column name for activities (default: 'activity') 
+    - activity_col: column name for activities (default: 'activity')
     - timestamp_col: column name for timestamps (default: 'timestamp')
-    - resource_col: column name for resources (default: 'resource')
-    - timestamp_format: Format des Timestamps (default: '%Y-%m-%d %H:%M:%S')
+    - max_row_expansion: rows creating more events than this count as one event (default: no limit)
+    - chunk_size: number of csv rows read at once (default: 100000)
+    - dtype: dtypes used for reading the csv (default: inferred by pandas)
     """
 
-    df = pd.read_csv(csv_path)
-    
-    expanded_rows = []
-    # identify potential multi-value fields
-    attr_cols = [c for c in df.columns if c not in [case_col, activity_col, timestamp_col]]
-    
-    for _, row in df.iterrows():
-        # declare empty case_ids to SYSTEM
-        raw_case = row.get(case_col)
-        if pd.isna(raw_case) or not str(raw_case).strip():
-            case_ids = ['SYSTEM']
-        else:
-            case_ids = [str(raw_case).strip()]
-        
-        # create lists for existing multi-value fields
-        split_values = {}
-        for col in attr_cols:
-            val = row.get(col)
-            if pd.notna(val) and isinstance(val, str) and ';' in val:
-                split_values[col] = [v.strip() for v in val.split(';')]
+    # count output events per input row, one chunk in memory at a time
+    row_counts = []
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_size, dtype=dtype):
+        attr_cols = [c for c in chunk.columns if c not in [case_col, activity_col, timestamp_col]]
+        row_counts.append(get_row_event_counts(chunk, attr_cols, max_row_expansion))
+
+    row_counts = np.concatenate(row_counts) if row_counts else np.zeros(0, dtype=np.int64)
+    return {
+        'row_counts': row_counts,
+        'total_events': int(row_counts.sum()),
+        'max_row_events': int(row_counts.max()) if len(row_counts) > 0 else 0
+    }
+
+def normalize_case_ids(case_ids: pd.Series) -> pd.Series:
+    """
+    params:
+    - case_ids: raw case id column
+    """
+
+    # declare empty case_ids to SYSTEM
+    stripped = case_ids.astype(str).str.strip()
+    return stripped.where(case_ids.notna() & (stripped != ''), 'SYSTEM')
+
+def expand_multi_values(df: pd.DataFrame, case_col: str, attr_cols: list,
+                        multi_value_policy='expand',
+                        max_row_expansion=None,
+                        scalar_cols=None) -> pd.DataFrame:
+    """
+    params:
+    - df: csv data frame (or chunk)
+    - case_col: column name for case ids
+    - attr_cols: potential multi-value columns
+    - multi_value_policy: 'expand' duplicates events per value combination, 'list' keeps list attributes
+    - max_row_expansion: rows creating more events than this keep list attributes (default: no limit)
+    - scalar_cols: columns that never become list attributes, their values are joined instead (default: none)
+    """
+
+    df = df.copy()
+    df[case_col] = normalize_case_ids(df[case_col])
+
+    split_counts = get_split_counts(df, attr_cols)
+    row_counts = split_counts.prod(axis=1).to_numpy()
+
+    # rows kept as a single event with list attributes
+    if multi_value_policy == 'list':
+        keep_as_list = np.ones(len(df), dtype=bool)
+    elif multi_value_policy == 'expand':
+        keep_as_list = row_counts > max_row_expansion if max_row_expansion is not None else np.zeros(len(df), dtype=bool)
+        if keep_as_list.any():
+            print(f"{keep_as_list.sum()} Zeilen überschreiten max_row_expansion={max_row_expansion} und behalten Multi-Values als Liste.")
+    else:
+        raise ValueError(f"Unbekannte multi_value_policy: {multi_value_policy}")
+
+    for col in attr_cols:
+        is_multi = keep_as_list & (split_counts[col].to_numpy() > 1)
+        if is_multi.any():
+            values = df[col].to_numpy(dtype=object).copy()
+            if col in (scalar_cols or []):
+                # e.g. resources: object ids must stay plain strings
+                values[is_multi] = [MULTI_VALUE_DELIMITER.join(v.strip() for v in val.split(MULTI_VALUE_DELIMITER))
+                                    for val in values[is_multi]]
             else:
-                split_values[col] = [val]
-        
-        # duplicate events for multi-value holding rows       
-        for case_id, combo in product(case_ids, product(*split_values.values())):
-            new_row = row.copy()
-            new_row[case_col] = case_id
-            for col, v in zip(split_values.keys(), combo):
-                new_row[col] = v
-            expanded_rows.append(new_row)
-    
+                # nested list attribute as expected by the pm4py xes exporter
+                values[is_multi] = [
+                    {'value': None, 'children': [(col, v.strip()) for v in val.split(MULTI_VALUE_DELIMITER)]}
+                    for val in values[is_multi]
+                ]
+            df[col] = values
+
+    # duplicate events for multi-value holding rows
+    repeats = np.where(keep_as_list, 1, row_counts)
+    if np.all(repeats == 1):
+        return df
+
+    # expanded events keep the index of their source row
+    expanded = df.take(np.repeat(np.arange(len(df)), repeats))
+
+    # position of each output event within the cartesian product of its row (last column varies fastest)
+    starts = np.cumsum(repeats) - repeats
+    position = np.arange(len(expanded)) - np.repeat(starts, repeats)
+    for col in reversed(attr_cols):
+        counts = np.where(keep_as_list, 1, split_counts[col].to_numpy())
+        is_multi = counts > 1
+        if not is_multi.any():
+            continue
+        col_counts = np.repeat(counts, repeats)
+        value_index = position % col_counts
+        position = position // col_counts
+
+        # flat array of all split values with the offset of each row's first value
+        split_values = df.loc[is_multi, col].str.split(MULTI_VALUE_DELIMITER).explode().str.strip().to_numpy()
+        offsets = np.zeros(len(df), dtype=np.int64)
+        offsets[is_multi] = np.cumsum(counts[is_multi]) - counts[is_multi]
+
+        multi_rows = np.repeat(is_multi, repeats)
+        values = expanded[col].to_numpy(dtype=object).copy()
+        values[multi_rows] = split_values[np.repeat(offsets, repeats)[multi_rows] + value_index[multi_rows]]
+        expanded[col] = values
+
+    return expanded
+
+def convert_csv_frame(df: pd.DataFrame,
+                      case_col: str,
+                      activity_col: str,
+                      timestamp_col: str,
+                      resource_col: str,
+                      timestamp_format: str,
+                      attr_cols: list,
+                      multi_value_policy='expand',
+                      max_row_expansion=None,
+                      chunk_size=100000) -> pd.DataFrame:
+    """
+    params:
+    - df: csv data frame (or a partition of complete cases)
+    - case_col, activity_col, timestamp_col, resource_col, timestamp_format: see csv_to_xes
+    - attr_cols: potential multi-value columns
+    - multi_value_policy, max_row_expansion, chunk_size: see csv_to_xes
+    """
+
+    # expand chunk by chunk so only one chunk's intermediate results are held at once
+    # (the expanded frame itself is complete in memory, bounded memory needs csv_to_xes(external_sort=True))
+    expanded_chunks = []
+    for start in range(0, max(len(df), 1), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        expanded_chunks.append(expand_multi_values(chunk, case_col, attr_cols, multi_value_policy, max_row_expansion, [resource_col]))
+
     # create data frame for newly added rows (events)
-    df_expanded = pd.DataFrame(expanded_rows)
-    
+    df_expanded = pd.concat(expanded_chunks)
+
     # rename columns according to XES-specification
     rename_dict = {
         case_col: 'case:concept:name',
@@ -61,18 +197,146 @@ def csv_to_xes(csv_path: str, xes_path: str,
         resource_col: 'org:resource'
     }
     df_expanded = df_expanded.rename(columns={k: v for k, v in rename_dict.items() if k in df_expanded.columns})
-    
+
     if 'time:timestamp' in df_expanded.columns:
-        df_expanded['time:timestamp'] = pd.to_datetime(
-            df_expanded['time:timestamp'], format=timestamp_format, errors='coerce')
-    
+        raw_timestamps = df_expanded['time:timestamp']
+        df_expanded['time:timestamp'] = pd.to_datetime(raw_timestamps, format=timestamp_format, errors='coerce')
+        num_unparseable = int((df_expanded['time:timestamp'].isna() & raw_timestamps.notna()).sum())
+        if num_unparseable > 0:
+            print(f"{num_unparseable} Timestamps passen nicht zu timestamp_format='{timestamp_format}' und bleiben leer.")
+
     if 'case:concept:name' in df_expanded.columns and 'time:timestamp' in df_expanded.columns:
         df_expanded = df_expanded.sort_values(['case:concept:name', 'time:timestamp'])
-    
+
+    return df_expanded
+
+def csv_to_xes(csv_path: str, xes_path: str,
+               case_col='case_id',
+               activity_col='activity',
+               timestamp_col='timestamp',
+               resource_col='resource',
+               timestamp_format='%Y-%m-%d %H:%M:%S',
+               multi_value_policy='expand',
+               max_row_expansion=None,
+               max_total_expansion=None,
+               chunk_size=100000,
+               n_jobs=1,
+               lineage_path=None,
+               external_sort=False,
+               tmp_dir=None):
+    """
+    params:
+    - csv_path: csv file path
+    - xes_path: xes output file path
+    - case_col: column name for case ids (default: 'case_id')
+    - activity_col: column name for activities (default: 'activity')
+    - timestamp_col: column name for timestamps (default: 'timestamp')
+    - resource_col: column name for resources (default: 'resource')
+    - timestamp_format: Format des Timestamps (default: '%Y-%m-%d %H:%M:%S')
+    - multi_value_policy: 'expand' duplicates events per value combination, 'list' keeps list attributes, resources are joined (default: 'expand')
+    - max_row_expansion: rows creating more events than this keep list attributes, resources are joined (default: no limit)
+    - max_total_expansion: maximum number of events after expansion, checked before expanding (default: no limit)
+    - chunk_size: number of csv rows expanded at once (default: 100000)
+    - n_jobs: number of worker processes, the result is identical to n_jobs=1 (default: 1)
+    - lineage_path: writes the source csv row of each xes event to this .npz file (default: no lineage)
+    - external_sort: sort on disk in runs of chunk_size rows for logs larger than memory, returns no event log (default: False).
+      Without it the whole expanded log is held in memory, only max_row_expansion and max_total_expansion bound its size.
+    - tmp_dir: directory for the temporary runs of the external sort (default: system temp directory)
+    """
+
+    if external_sort:
+        return csv_to_xes_external(csv_path, xes_path, case_col, activity_col, timestamp_col, resource_col,
+                                   timestamp_format, multi_value_policy, max_row_expansion, max_total_expansion,
+                                   chunk_size, lineage_path, tmp_dir)
+
+    df = pd.read_csv(csv_path)
+
+    # identify potential multi-value fields
+    attr_cols = [c for c in df.columns if c not in [case_col, activity_col, timestamp_col]]
+
+    # pre-pass: exact number of events after expansion (nothing is expanded yet)
+    if max_total_expansion is not None and multi_value_policy == 'expand':
+        total_events = int(get_row_event_counts(df, attr_cols, max_row_expansion).sum())
+        if total_events > max_total_expansion:
+            raise ValueError(f"Expansion ergibt {total_events} Events, erlaubt sind {max_total_expansion}.")
+
+    convert = partial(convert_csv_frame, case_col=case_col, activity_col=activity_col, timestamp_col=timestamp_col,
+                      resource_col=resource_col, timestamp_format=timestamp_format, attr_cols=attr_cols,
+                      multi_value_policy=multi_value_policy, max_row_expansion=max_row_expansion, chunk_size=chunk_size)
+
+    if n_jobs > 1:
+        # convert hash partitions of the cases in parallel
+        partitions = partition_by_case(df, normalize_case_ids(df[case_col]), n_jobs)
+        df_expanded = pd.concat(map_partitions(convert, partitions, n_jobs))
+
+        # merge in the same order as the single-process conversion (cases are disjoint across partitions)
+        if 'case:concept:name' in df_expanded.columns and 'time:timestamp' in df_expanded.columns:
+            df_expanded = df_expanded.sort_values('case:concept:name', kind='stable')
+        else:
+            df_expanded = df_expanded.sort_index(kind='stable')
+    else:
+        df_expanded = convert(df)
+
+    # expanded events still carry the index of their source row (1 -> N for multi-values)
+    if lineage_path is not None:
+        save_lineage(lineage_path, df_expanded.index.to_numpy(), len(df))
+    df_expanded = df_expanded.reset_index(drop=True)
+
     event_log = pm4py.convert_to_event_log(df_expanded)
     pm4py.write_xes(event_log, xes_path)
-    
+
     return event_log
 
+def csv_to_xes_external(csv_path: str, xes_path: str,
+                        case_col='case_id',
+                        activity_col='activity',
+                        timestamp_col='timestamp',
+                        resource_col='resource',
+                        timestamp_format='%Y-%m-%d %H:%M:%S',
+                        multi_value_policy='expand',
+                        max_row_expansion=None,
+                        max_total_expansion=None,
+                        chunk_size=100000,
+                        lineage_path=None,
+                        tmp_dir=None):
+    """
+    params:
+    - see csv_to_xes (only chunk_size rows and one block per run are held in memory)
+    """
+
+    # dtypes of the whole file, so that every chunk is read like the full csv
+    dtypes = infer_csv_dtypes(csv_path, chunk_size)
+    attr_cols = [c for c in dtypes if c not in [case_col, activity_col, timestamp_col]]
+    if case_col not in dtypes or timestamp_col not in dtypes:
+        raise ValueError(f"external_sort braucht die Spalten '{case_col}' und '{timestamp_col}'.")
+
+    # pre-pass: exact number of events after expansion (nothing is expanded yet)
+    if max_total_expansion is not None and multi_value_policy == 'expand':
+        total_events = estimate_expansion(csv_path, case_col, activity_col, timestamp_col, max_row_expansion, chunk_size, dtypes)['total_events']
+        if total_events > max_total_expansion:
+            raise ValueError(f"Expansion ergibt {total_events} Events, erlaubt sind {max_total_expansion}.")
+
+    run_dir = tempfile.mkdtemp(prefix='csv_to_xes_', dir=tmp_dir)
+    try:
+        # sorted runs: every chunk is expanded, sorted and spilled to disk
+        run_paths = []
+        num_rows = 0
+        columns, run_dtypes = None, None
+        for chunk in pd.read_csv(csv_path, chunksize=chunk_size, dtype=dtypes):
+            run = convert_csv_frame(chunk, case_col, activity_col, timestamp_col, resource_col, timestamp_format,
+                                    attr_cols, multi_value_policy, max_row_expansion, chunk_size)
+            if columns is None:
+                columns, run_dtypes = list(run.columns), run.dtypes.to_dict()
+            run_paths.append(os.path.join(run_dir, f"run_{len(run_paths)}.pkl"))
+            spill_run(run, run_paths[-1])
+            num_rows += len(chunk)
+
+        # k-way merge streamed into the xes file
+        source_index = external_sort_to_xes(run_paths, columns, run_dtypes, xes_path)
+        if lineage_path is not None:
+            save_lineage(lineage_path, source_index, num_rows)
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+
 if __name__ == '__main__':
     csv_to_xes('data/sample_data/csv_sample_simple.csv', 'data/generated_data/roundtrip/xes_from_csv_simple.xes')
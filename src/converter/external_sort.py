@@ -0,0 +1,151 @@
+import heapq
+import pickle
+from io import BytesIO
+import numpy as np
+import pandas as pd
+import pm4py
+from pm4py.objects.log.obj import EventLog
+from pm4py.objects.log.exporter.xes.variants import line_by_line
+
+# number of rows per pickled block of a run (only one block per run is held in memory while merging)
+RUN_BLOCK_ROWS = 10000
+
+# number of merged events converted to traces at once (cut at case boundaries)
+TRACE_BATCH_ROWS = 50000
+
+# sort key for missing timestamps (sorted last within a case, as in pandas)
+MISSING_TIMESTAMP_KEY = np.iinfo(np.int64).max
+
+def infer_csv_dtypes(csv_path: str, chunk_size=100000) -> dict:
+    """
+    params:
+    - csv_path: csv file path
+    - chunk_size: number of csv rows read at once (default: 100000)
+    """
+
+    # combine the dtypes pandas infers per chunk (int and float -> float, other conflicts -> object)
+    dtypes = {}
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_size):
+        for col, dtype in chunk.dtypes.items():
+            dtype = str(dtype)
+            if col not in dtypes or dtypes[col] == dtype:
+                dtypes[col] = dtype
+            elif {dtypes[col], dtype} <= {'int64', 'float64'}:
+                dtypes[col] = 'float64'
+            else:
+                dtypes[col] = 'object'
+    return dtypes
+
+def spill_run(run: pd.DataFrame, run_path: str, block_rows=RUN_BLOCK_ROWS):
+    """
+    params:
+    - run: sorted data frame (index = source row)
+    - run_path: temporary run file path
+    - block_rows: number of rows per pickled block (default: 10000)
+    """
+
+    with open(run_path, 'wb') as f:
+        for start in range(0, len(run), block_rows):
+            pickle.dump(run.iloc[start:start + block_rows], f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def iter_run(run_path: str, run_id: int, case_col: str, timestamp_col: str):
+    """
+    params:
+    - run_path: temporary run file path
+    - run_id: position of the run (breaks ties between runs in input order)
+    - case_col: case column of the run
+    - timestamp_col: timestamp column of the run
+    """
+
+    position = 0
+    with open(run_path, 'rb') as f:
+        while True:
+            try:
+                block = pickle.load(f)
+            except EOFError:
+                return
+            timestamps = block[timestamp_col]
+            timestamp_keys = np.where(timestamps.isna(), MISSING_TIMESTAMP_KEY, timestamps.to_numpy(dtype='datetime64[ns]').view(np.int64))
+            records = block.itertuples(index=False, name=None)
+            # (case, timestamp, run, position) is unique, so the record itself is never compared
+            for case_id, timestamp_key, source_index, record in zip(block[case_col], timestamp_keys, block.index, records):
+                yield case_id, timestamp_key, run_id, position, source_index, record
+                position += 1
+
+def merge_runs(run_paths: list, case_col: str, timestamp_col: str):
+    """
+    params:
+    - run_paths: temporary run file paths in input order
+    - case_col: case column of the runs
+    - timestamp_col: timestamp column of the runs
+    """
+
+    # k-way merge, equal keys keep their input order (like a stable in-memory sort)
+    return heapq.merge(*[iter_run(path, i, case_col, timestamp_col) for i, path in enumerate(run_paths)])
+
+def iter_case_batches(merged_rows, batch_rows=TRACE_BATCH_ROWS):
+    """
+    params:
+    - merged_rows: merged rows (merge_runs)
+    - batch_rows: minimum number of rows per batch (default: 50000)
+    """
+
+    # batches only end between two cases so that every trace is converted as a whole
+    batch = []
+    for row in merged_rows:
+        if len(batch) >= batch_rows and row[0] != batch[-1][0]:
+            yield batch
+            batch = []
+        batch.append(row)
+    if batch:
+        yield batch
+
+def write_xes_stream(logs, xes_path: str, encoding='utf-8'):
+    """
+    params:
+    - logs: iterable of event logs holding consecutive traces (log attributes are taken from the first)
+    - xes_path: xes output file path
+    - encoding: file encoding (default: 'utf-8')
+    """
+
+    parameters = {line_by_line.Parameters.SHOW_PROGRESS_BAR: False}
+    with open(xes_path, 'wb') as f:
+        footer = None
+        for log in logs:
+            if footer is None:
+                # header exactly as pm4py writes it, taken from the log without traces
+                header = BytesIO()
+                empty_log = EventLog(attributes=log.attributes, extensions=log.extensions,
+                                     omni_present=log.omni_present, classifiers=log.classifiers)
+                line_by_line.export_log_line_by_line(empty_log, header, encoding, parameters=parameters)
+                footer = "</log>\n".encode(encoding)
+                f.write(header.getvalue()[:-len(footer)])
+            for trace in log:
+                line_by_line.export_trace_line_by_line(trace, f, encoding)
+        if footer is not None:
+            f.write(footer)
+
+def external_sort_to_xes(run_paths: list, columns: list, dtypes: dict, xes_path: str,
+                         case_col='case:concept:name', timestamp_col='time:timestamp'):
+    """
+    params:
+    - run_paths: temporary run file paths in input order
+    - columns: columns of the runs
+    - dtypes: dtypes of the runs
+    - xes_path: xes output file path
+    - case_col: case column of the runs (default: 'case:concept:name')
+    - timestamp_col: timestamp column of the runs (default: 'time:timestamp')
+    """
+
+    source_indices = []
+
+    def iter_logs():
+        for batch in iter_case_batches(merge_runs(run_paths, case_col, timestamp_col)):
+            source_indices.append(np.fromiter((row[4] for row in batch), dtype=np.int64, count=len(batch)))
+            df_batch = pd.DataFrame([row[5] for row in batch], columns=columns).astype(dtypes)
+            yield pm4py.convert_to_event_log(df_batch)
+
+    write_xes_stream(iter_logs(), xes_path)
+
+    # source csv row of each written event (in output order)
+    return np.concatenate(source_indices) if source_indices else np.zeros(0, dtype=np.int64)
@@ -0,0 +1,56 @@
+import json
+import sqlite3
+import numpy as np
+import pandas as pd
+from ocel2_sqlite import is_ocel2_sqlite
+
+def save_lineage(lineage_path: str, event_source_index, num_source_events: int,
+                 object_offsets=None, object_source_index=None):
+    """
+    params:
+    - lineage_path: lineage output file path (.npz)
+    - event_source_index: source event position of each output event (in output order)
+    - num_source_events: number of events (csv rows) of the source file
+    - object_offsets: start of each output object's positions in object_source_index, plus the total (optional)
+    - object_source_index: source event positions of all output objects, concatenated (optional)
+    """
+
+    arrays = {
+        'event_source_index': np.asarray(event_source_index, dtype=np.int64),
+        'num_source_events': np.int64(num_source_events)
+    }
+    if object_offsets is not None:
+        arrays['object_offsets'] = np.asarray(object_offsets, dtype=np.int64)
+        arrays['object_source_index'] = np.asarray(object_source_index, dtype=np.int64)
+    np.savez(lineage_path, **arrays)
+
+def group_positions(codes: np.ndarray, num_groups: int):
+    """
+    params:
+    - codes: group code of each source event (-1 for none)
+    - num_groups: number of groups
+    """
+
+    # csr layout: positions of group i are positions[offsets[i]:offsets[i + 1]]
+    codes = np.asarray(codes, dtype=np.int64)
+    order = np.argsort(codes, kind='stable')
+    positions = order[codes[order] >= 0]
+    counts = np.bincount(codes[codes >= 0], minlength=num_groups)
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    return offsets, positions
+
+def read_ocel2_event_ids(ocel2_path: str) -> pd.Index:
+    """
+    params:
+    - ocel2_path: OCEL2 file path (JSON or SQLite)
+    """
+
+    # event ids in file order (pm4py reorders events by timestamp when reading)
+    if is_ocel2_sqlite(ocel2_path):
+        conn = sqlite3.connect(ocel2_path)
+        ids = [row[0] for row in conn.execute('SELECT "ocel_id" FROM "event" ORDER BY rowid')]
+        conn.close()
+    else:
+        with open(ocel2_path) as f:
+            ids = [event['id'] for event in json.load(f)['events']]
+    return pd.Index(ids)
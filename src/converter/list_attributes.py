@@ -0,0 +1,20 @@
+import pandas as pd
+
+# delimiter of multi-value csv cells and of joined list attribute values
+MULTI_VALUE_DELIMITER = ';'
+
+def flatten_list_attributes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    params:
+    - df: xes event data frame (pm4py reads list attributes as {'value': None, 'children': [(key, value), ...]})
+    """
+
+    # list attributes become the joined string of their values, so they are hashable like any other value
+    for col in df.columns[df.dtypes == object]:
+        # plain string columns are recognized without a python loop
+        if pd.api.types.infer_dtype(df[col], skipna=True) in ['string', 'empty']:
+            continue
+        is_list = df[col].map(lambda v: isinstance(v, dict) and 'children' in v).to_numpy()
+        if is_list.any():
+            df.loc[is_list, col] = [MULTI_VALUE_DELIMITER.join(str(value) for _, value in v['children']) for v in df.loc[is_list, col]]
+    return df
@@ -0,0 +1,194 @@
+import gc
+import glob
+import os
+import signal
+import threading
+
+# share of the budget at which the running strategy is interrupted and the next cheaper one is started
+DEFAULT_SOFT_FRACTION = 0.8
+
+# seconds between two rss measurements
+MONITOR_INTERVAL = 0.05
+
+class MemoryBudgetExceeded(MemoryError):
+    pass
+
+def get_child_pids() -> list:
+    """
+    params:
+    - none (direct child processes, e.g. pool workers)
+    """
+
+    pids = []
+    for children_path in glob.glob('/proc/self/task/*/children'):
+        with open(children_path) as f:
+            pids.extend(f.read().split())
+    return pids
+
+def get_process_rss() -> int:
+    """
+    params:
+    - none (resident memory of this process and its child processes, read from /proc/<pid>/statm)
+    """
+
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    pids = [str(os.getpid())] + get_child_pids()
+
+    rss = 0
+    for pid in pids:
+        try:
+            with open(f'/proc/{pid}/statm') as f:
+                rss += int(f.read().split()[1]) * page_size
+        except (FileNotFoundError, ProcessLookupError):
+            pass  # child exited meanwhile
+    return rss
+
+def get_memory_limit():
+    """
+    params:
+    - none (container limit of cgroup v2 or v1, otherwise the available memory plus the own rss)
+    """
+
+    for limit_path in ['/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes']:
+        try:
+            with open(limit_path) as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        # 'max' or a huge v1 value means no limit
+        if value.isdigit() and int(value) < 2 ** 60:
+            return int(value)
+
+    try:
+        with open('/proc/meminfo') as f:
+            meminfo = {line.split(':')[0]: line.split()[1] for line in f}
+        return int(meminfo['MemAvailable']) * 1024 + get_process_rss()
+    except (OSError, KeyError):
+        return None
+
+def choose_strategy(strategies: list, budget_bytes: int, soft_fraction=DEFAULT_SOFT_FRACTION) -> int:
+    """
+    params:
+    - strategies: (name, function, estimated bytes) ordered from the most expensive to the cheapest
+    - budget_bytes: memory budget
+    - soft_fraction: share of the budget the estimate may use (default: 0.8)
+    """
+
+    # the fastest strategy that fits next to the memory already in use, otherwise the cheapest
+    available = budget_bytes * soft_fraction - get_process_rss()
+    for i, (_, _, estimated_bytes) in enumerate(strategies):
+        if estimated_bytes <= available:
+            return i
+    return len(strategies) - 1
+
+def start_rss_monitor(soft_limit_bytes: int, interrupt=True, interval=MONITOR_INTERVAL) -> dict:
+    """
+    params:
+    - soft_limit_bytes: rss at which the run is interrupted
+    - interrupt: raise MemoryBudgetExceeded in the main thread when the limit is reached (default: True)
+    - interval: seconds between two measurements (default: 0.05)
+    """
+
+    # children that existed before the run (e.g. a loader pool of the caller) are not terminated
+    monitor = {'peak_rss_bytes': get_process_rss(), 'exceeded': False, 'stop': threading.Event(),
+               'initial_children': set(get_child_pids())}
+
+    def watch():
+        while not monitor['stop'].wait(interval):
+            rss = get_process_rss()
+            monitor['peak_rss_bytes'] = max(monitor['peak_rss_bytes'], rss)
+            if rss > soft_limit_bytes and not monitor['exceeded']:
+                monitor['exceeded'] = True
+                if interrupt:
+                    # workers of the run would keep allocating until the pool shuts down
+                    for pid in set(get_child_pids()) - monitor['initial_children']:
+                        try:
+                            os.kill(int(pid), signal.SIGTERM)
+                        except ProcessLookupError:
+                            pass
+                    signal.pthread_kill(threading.main_thread().ident, signal.SIGUSR1)
+                    return
+
+    monitor['thread'] = threading.Thread(target=watch, daemon=True)
+    monitor['thread'].start()
+    return monitor
+
+def stop_rss_monitor(monitor: dict) -> int:
+    """
+    params:
+    - monitor: running monitor (start_rss_monitor)
+    """
+
+    monitor['stop'].set()
+    monitor['thread'].join()
+    return monitor['peak_rss_bytes']
+
+def raise_budget_exceeded(signum, frame):
+    """
+    params:
+    - signum, frame: see signal.signal (SIGUSR1 sent by the rss monitor)
+    """
+
+    raise MemoryBudgetExceeded("Speicherbudget überschritten, Abbruch vor dem Limit.")
+
+def run_with_budget(strategies: list, budget_bytes=None, soft_fraction=DEFAULT_SOFT_FRACTION) -> dict:
+    """
+    params:
+    - strategies: (name, function without arguments, estimated bytes) ordered from the most expensive to the cheapest
+    - budget_bytes: memory budget (default: container limit, see get_memory_limit)
+    - soft_fraction: share of the budget at which a strategy is interrupted (default: 0.8)
+    """
+
+    if budget_bytes is None:
+        budget_bytes = get_memory_limit()
+    if budget_bytes is None:
+        raise ValueError("Kein Speicherbudget angegeben und kein Limit ermittelbar.")
+
+    # interrupting needs a signal handler, which only the main thread can install
+    can_interrupt = threading.current_thread() is threading.main_thread()
+    first = choose_strategy(strategies, budget_bytes, soft_fraction)
+    report = {
+        'budget_bytes': budget_bytes,
+        'estimates': {name: estimated_bytes for name, _, estimated_bytes in strategies},
+        'chosen_strategy': strategies[first][0],
+        'fallbacks': [],
+        'peak_rss_bytes': 0
+    }
+
+    for i in range(first, len(strategies)):
+        name, func, _ = strategies[i]
+        # the cheapest strategy has no fallback and runs to the end
+        interrupt = can_interrupt and i < len(strategies) - 1
+        previous_handler = signal.signal(signal.SIGUSR1, raise_budget_exceeded) if interrupt else None
+        monitor = start_rss_monitor(int(budget_bytes * soft_fraction), interrupt)
+        try:
+            result = func()
+        except Exception:
+            # an interrupted strategy may also fail with a follow-up error (e.g. a broken process pool)
+            if not monitor['exceeded']:
+                raise
+            report['fallbacks'].append(name)
+            continue
+        finally:
+            report['peak_rss_bytes'] = max(report['peak_rss_bytes'], stop_rss_monitor(monitor))
+            if interrupt:
+                signal.signal(signal.SIGUSR1, previous_handler)
+            gc.collect()
+        report['strategy'] = name
+        report['result'] = result
+        return report
+
+def print_governor_report(report: dict):
+    """
+    params:
+    - report: governor report (run_with_budget)
+    """
+
+    print(f"Speicherbudget: {report['budget_bytes'] / 2 ** 20:.0f} MiB")
+    for name, estimated_bytes in report['estimates'].items():
+        print(f"  Schätzung {name}: {estimated_bytes / 2 ** 20:.0f} MiB")
+    print(f"Gewählte Strategie: {report['chosen_strategy']}")
+    if report['fallbacks']:
+        print(f"Abgebrochen wegen Speicher: {', '.join(report['fallbacks'])}")
+    print(f"Verwendete Strategie: {report['strategy']}")
+    print(f"Maximaler RSS: {report['peak_rss_bytes'] / 2 ** 20:.0f} MiB")
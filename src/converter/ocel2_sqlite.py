@@ -0,0 +1,124 @@
+import sqlite3
+import os
+
+# sql column types for the OCEL2 attribute types
+SQL_TYPES = {
+    'string': 'TEXT',
+    'time': 'TIMESTAMP',
+    'integer': 'INTEGER',
+    'float': 'REAL',
+    'boolean': 'INTEGER'
+}
+
+# time of the initial object attribute values (OCEL2 standard)
+INITIAL_TIME = '1970-01-01T00:00:00+00:00'
+
+def is_ocel2_sqlite(path: str) -> bool:
+    """
+    params:
+    - path: OCEL2 file path
+    """
+
+    return str(path).lower().endswith('.sqlite')
+
+def is_initial_value(attribute: dict) -> bool:
+    """
+    params:
+    - attribute: object attribute entry (name, value and optional time)
+    """
+
+    return str(attribute.get('time', INITIAL_TIME)).startswith('1970-01-01')
+
+def get_type_table_names(type_names: list) -> dict:
+    """
+    params:
+    - type_names: event or object type names
+    """
+
+    # table suffixes may only contain letters and digits (e.g. 'Create Order' -> 'CreateOrder')
+    table_names = {}
+    for name in type_names:
+        table_name = ''.join(c for c in str(name).title() if c.isalnum()) or 'Type'
+        candidate, i = table_name, 1
+        while candidate in table_names.values():
+            candidate, i = f"{table_name}{i}", i + 1
+        table_names[name] = candidate
+    return table_names
+
+def write_ocel2_sqlite(ocel: dict, sqlite_path: str):
+    """
+    params:
+    - ocel: OCEL2 structure as written to JSON (objectTypes, eventTypes, objects, events)
+    - sqlite_path: OCEL2 SQLite output file path
+    """
+
+    if os.path.exists(sqlite_path):
+        os.remove(sqlite_path)
+
+    conn = sqlite3.connect(sqlite_path)
+    with conn:
+        conn.execute('CREATE TABLE "event_map_type" ("ocel_type" TEXT PRIMARY KEY, "ocel_type_map" TEXT)')
+        conn.execute('CREATE TABLE "object_map_type" ("ocel_type" TEXT PRIMARY KEY, "ocel_type_map" TEXT)')
+        conn.execute('CREATE TABLE "event" ("ocel_id" TEXT PRIMARY KEY, '
+                     '"ocel_type" TEXT REFERENCES "event_map_type" ("ocel_type"))')
+        conn.execute('CREATE TABLE "object" ("ocel_id" TEXT PRIMARY KEY, '
+                     '"ocel_type" TEXT REFERENCES "object_map_type" ("ocel_type"))')
+        conn.execute('CREATE TABLE "event_object" ('
+                     '"ocel_event_id" TEXT REFERENCES "event" ("ocel_id"), '
+                     '"ocel_object_id" TEXT REFERENCES "object" ("ocel_id"), '
+                     '"ocel_qualifier" TEXT, PRIMARY KEY ("ocel_event_id", "ocel_object_id", "ocel_qualifier"))')
+        conn.execute('CREATE TABLE "object_object" ('
+                     '"ocel_source_id" TEXT REFERENCES "object" ("ocel_id"), '
+                     '"ocel_target_id" TEXT REFERENCES "object" ("ocel_id"), '
+                     '"ocel_qualifier" TEXT, PRIMARY KEY ("ocel_source_id", "ocel_target_id", "ocel_qualifier"))')
+
+        # one table per event type
+        event_tables = get_type_table_names([t['name'] for t in ocel['eventTypes']])
+        event_attrs = {}
+        for event_type in ocel['eventTypes']:
+            table = event_tables[event_type['name']]
+            event_attrs[event_type['name']] = [a['name'] for a in event_type['attributes']]
+            columns = ''.join(f', "{a["name"]}" {SQL_TYPES.get(a["type"], "TEXT")}' for a in event_type['attributes'])
+            conn.execute(f'CREATE TABLE "event_{table}" ("ocel_id" TEXT PRIMARY KEY REFERENCES "event" ("ocel_id"), '
+                         f'"ocel_time" TIMESTAMP{columns})')
+            conn.execute('INSERT INTO "event_map_type" VALUES (?, ?)', (event_type['name'], table))
+
+        # one table per object type
+        object_tables = get_type_table_names([t['name'] for t in ocel['objectTypes']])
+        object_attrs = {}
+        for object_type in ocel['objectTypes']:
+            table = object_tables[object_type['name']]
+            object_attrs[object_type['name']] = [a['name'] for a in object_type['attributes']]
+            columns = ''.join(f', "{a["name"]}" {SQL_TYPES.get(a["type"], "TEXT")}' for a in object_type['attributes'])
+            conn.execute(f'CREATE TABLE "object_{table}" ("ocel_id" TEXT REFERENCES "object" ("ocel_id"), '
+                         f'"ocel_time" TIMESTAMP, "ocel_changed_field" TEXT{columns})')
+            conn.execute('INSERT INTO "object_map_type" VALUES (?, ?)', (object_type['name'], table))
+
+        # events and their e2o relationships
+        conn.executemany('INSERT INTO "event" VALUES (?, ?)', ((e['id'], e['type']) for e in ocel['events']))
+        conn.executemany('INSERT OR IGNORE INTO "event_object" VALUES (?, ?, ?)',
+                         ((e['id'], r['objectId'], r.get('qualifier')) for e in ocel['events'] for r in e['relationships']))
+        event_rows = {event_type: [] for event_type in event_attrs}
+        for e in ocel['events']:
+            values = {a['name']: a['value'] for a in e['attributes']}
+            event_rows[e['type']].append([e['id'], e['time']] + [values.get(a) for a in event_attrs[e['type']]])
+        for event_type, rows in event_rows.items():
+            placeholders = ', '.join(['?'] * (len(event_attrs[event_type]) + 2))
+            conn.executemany(f'INSERT INTO "event_{event_tables[event_type]}" VALUES ({placeholders})', rows)
+
+        # objects, their o2o relationships and attribute values (initial row plus one row per change)
+        conn.executemany('INSERT INTO "object" VALUES (?, ?)', ((o['id'], o['type']) for o in ocel['objects']))
+        conn.executemany('INSERT OR IGNORE INTO "object_object" VALUES (?, ?, ?)',
+                         ((o['id'], r['objectId'], r.get('qualifier')) for o in ocel['objects'] for r in o['relationships']))
+        object_rows = {object_type: [] for object_type in object_attrs}
+        for o in ocel['objects']:
+            attrs = object_attrs[o['type']]
+            initial = {a['name']: a['value'] for a in o['attributes'] if is_initial_value(a)}
+            object_rows[o['type']].append([o['id'], INITIAL_TIME, None] + [initial.get(a) for a in attrs])
+            for a in o['attributes']:
+                if not is_initial_value(a):
+                    object_rows[o['type']].append([o['id'], a['time'], a['name']] + [a['value'] if n == a['name'] else None for n in attrs])
+        for object_type, rows in object_rows.items():
+            placeholders = ', '.join(['?'] * (len(object_attrs[object_type]) + 3))
+            conn.executemany(f'INSERT INTO "object_{object_tables[object_type]}" VALUES ({placeholders})', rows)
+    conn.close()
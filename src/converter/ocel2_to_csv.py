@@ -1,14 +1,18 @@
 import pm4py  
 import pandas as pd 
+from lineage import save_lineage, read_ocel2_event_ids
   
-def ocel2_to_csv(ocel2_path: str, csv_path: str):
+CONVERTER_VERSION = '1'
+
+def ocel2_to_csv(ocel2_path: str, csv_path: str, lineage_path=None):
     """
     params:
-    - ocel2_path: OCEL2 file path
+    - ocel2_path: OCEL2 file path (JSON or SQLite)
     - csv_path: CSV output file path
+    - lineage_path: writes the source event position of each csv row to this .npz file (default: no lineage)
     """
     
-    ocel = pm4py.read_ocel2_json(ocel2_path)
+    ocel = pm4py.read_ocel2(ocel2_path)
       
     # identify primary case type by frequency
     primary_case_type = ocel.relations.groupby('ocel:type').size().idxmax()
@@ -37,5 +41,10 @@ def ocel2_to_csv(ocel2_path: str, csv_path: str):
 
     pd.DataFrame(csv_rows).to_csv(csv_path, index=False)
 
+    # one row per event, positions refer to the event order of the OCEL2 file
+    if lineage_path is not None:
+        event_ids = read_ocel2_event_ids(ocel2_path)
+        save_lineage(lineage_path, event_ids.get_indexer(ocel.events['ocel:eid']), len(event_ids))
+
 if __name__ == "__main__":
     ocel2_to_csv('data/generated_data/roundtrip/ocel2_from_xes_simple.json', 'data/generated_data/roundtrip/csv_from_ocel2_simple.csv')
\ No newline at end of file
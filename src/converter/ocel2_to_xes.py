@@ -1,21 +1,34 @@
 import pm4py
+from lineage import save_lineage, read_ocel2_event_ids
 
-def ocel2_to_xes(ocel2_path: str, xes_path: str):
+CONVERTER_VERSION = '1'
+
+def ocel2_to_xes(ocel2_path: str, xes_path: str, lineage_path=None):
     """
     params:
-    - ocel2_path: OCEL2 file path
+    - ocel2_path: OCEL2 file path (JSON or SQLite)
     - xes_path: XES output file path
+    - lineage_path: writes the source event position of each xes event to this .npz file (default: no lineage)
     """
 
-    ocel = pm4py.read_ocel2_json(ocel2_path)
+    ocel = pm4py.read_ocel2(ocel2_path)
     
     # identify primary case type by frequency
     object_type = ocel.relations.groupby('ocel:type').size().idxmax()
 
     flattened_log = pm4py.ocel_flattening(ocel, object_type)
+
+    # convert explicitly so that the lineage follows the trace order of the written log
+    flattened_log = pm4py.convert_to_event_log(flattened_log)
       
     pm4py.write_xes(flattened_log, xes_path)
 
+    # events related to several objects are duplicated, events without an object of the type are dropped
+    if lineage_path is not None:
+        event_ids = read_ocel2_event_ids(ocel2_path)
+        flattened_ids = [event['ocel:eid'] for trace in flattened_log for event in trace]
+        save_lineage(lineage_path, event_ids.get_indexer(flattened_ids), len(event_ids))
+
     # print the used object type after success 
     print(f"Verwendeter Objekttyp als Case-Notion: {object_type}")
 
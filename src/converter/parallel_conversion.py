@@ -0,0 +1,29 @@
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+def partition_by_case(df: pd.DataFrame, case_ids: pd.Series, num_partitions: int) -> list:
+    """
+    params:
+    - df: event data frame
+    - case_ids: case id of each row (all events of a case end up in the same partition)
+    - num_partitions: number of partitions
+    """
+
+    # stable hash (independent of the python process), rows keep their original order within a partition
+    partition_ids = pd.util.hash_pandas_object(case_ids.astype(str), index=False).to_numpy() % num_partitions
+    return [df[partition_ids == i] for i in range(num_partitions)]
+
+def map_partitions(func, partitions: list, n_jobs: int) -> list:
+    """
+    params:
+    - func: picklable function converting a single partition
+    - partitions: list of partitions
+    - n_jobs: number of worker processes
+    """
+
+    if n_jobs <= 1 or len(partitions) <= 1:
+        return [func(partition) for partition in partitions]
+
+    # results are returned in partition order, independent of which worker finishes first
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        return list(executor.map(func, partitions))
@@ -0,0 +1,111 @@
+import os
+import pandas as pd
+from csv_to_xes import csv_to_xes, get_split_counts
+from xes_to_ocel2 import xes_to_ocel2
+from memory_budget import get_memory_limit, get_process_rss, run_with_budget, print_governor_report, DEFAULT_SOFT_FRACTION
+
+# memory per event above the interpreter baseline (measured with pm4py event logs / OCEL2 dicts)
+CSV_TO_XES_EVENT_BYTES = 1100
+XES_TO_OCEL2_EVENT_BYTES = 1800
+
+# events held at once by the external sort besides the current run (see external_sort.TRACE_BATCH_ROWS)
+EXTERNAL_SORT_BATCH_EVENTS = 50000
+
+# bytes read for the event density of xes files
+XES_SAMPLE_BYTES = 1024 * 1024
+
+def estimate_csv_events(csv_path: str, sample_rows=1000, multi_value_policy='expand',
+                        case_col='case_id', activity_col='activity', timestamp_col='timestamp') -> dict:
+    """
+    params:
+    - csv_path: csv file path
+    - sample_rows: number of rows read for the estimate (default: 1000)
+    - multi_value_policy, case_col, activity_col, timestamp_col: see csv_to_xes
+    """
+
+    sample = pd.read_csv(csv_path, nrows=sample_rows)
+    with open(csv_path, 'rb') as f:
+        sample_bytes = sum(len(line) for _, line in zip(range(len(sample) + 1), f))
+    file_size = os.path.getsize(csv_path)
+
+    # rows from the bytes per sample row, events from the mean expansion of the sample rows
+    num_rows = len(sample) if sample_bytes >= file_size else int(file_size / sample_bytes * len(sample))
+    expansion = 1.0
+    if multi_value_policy == 'expand' and len(sample) > 0:
+        attr_cols = [c for c in sample.columns if c not in [case_col, activity_col, timestamp_col]]
+        expansion = float(get_split_counts(sample, attr_cols).prod(axis=1).mean())
+    return {
+        'num_rows': num_rows,
+        'expansion': expansion,
+        'num_events': int(num_rows * expansion)
+    }
+
+def estimate_xes_events(xes_path: str, sample_bytes=XES_SAMPLE_BYTES) -> int:
+    """
+    params:
+    - xes_path: xes file path
+    - sample_bytes: number of bytes read for the estimate (default: 1 MiB)
+    """
+
+    with open(xes_path, 'rb') as f:
+        sample = f.read(sample_bytes)
+    file_size = os.path.getsize(xes_path)
+    return int(sample.count(b'<event') * file_size / max(len(sample), 1))
+
+def governed_csv_to_xes(csv_path: str, xes_path: str, memory_budget=None, soft_fraction=DEFAULT_SOFT_FRACTION, **params) -> dict:
+    """
+    params:
+    - csv_path: csv file path
+    - xes_path: xes output file path
+    - memory_budget: memory budget in bytes (default: container limit)
+    - soft_fraction: share of the budget at which the in-memory conversion falls back to the external sort (default: 0.8)
+    - params: further csv_to_xes parameters (external_sort and chunk_size are chosen here)
+    """
+
+    if memory_budget is None:
+        memory_budget = get_memory_limit()
+    estimate = estimate_csv_events(csv_path, multi_value_policy=params.get('multi_value_policy', 'expand'),
+                                   case_col=params.get('case_col', 'case_id'), activity_col=params.get('activity_col', 'activity'),
+                                   timestamp_col=params.get('timestamp_col', 'timestamp'))
+
+    # runs of the external sort sized to the budget left after the memory in use and the trace batches
+    # (never more than the whole log, a small file is as cheap in memory as externally)
+    event_budget = (memory_budget * soft_fraction - get_process_rss()) / CSV_TO_XES_EVENT_BYTES - EXTERNAL_SORT_BATCH_EVENTS
+    chunk_size = int(max(min(event_budget / estimate['expansion'], 100000), 1000))
+    params = {k: v for k, v in params.items() if k not in ['external_sort', 'chunk_size']}
+
+    strategies = [
+        ('in_memory', lambda: csv_to_xes(csv_path, xes_path, **params),
+         estimate['num_events'] * CSV_TO_XES_EVENT_BYTES),
+        ('external', lambda: csv_to_xes(csv_path, xes_path, external_sort=True, chunk_size=chunk_size, **params),
+         int(min(estimate['num_events'], chunk_size * estimate['expansion'] + EXTERNAL_SORT_BATCH_EVENTS) * CSV_TO_XES_EVENT_BYTES))
+    ]
+    report = run_with_budget(strategies, memory_budget, soft_fraction)
+    report['estimated_events'] = estimate['num_events']
+    return report
+
+def governed_xes_to_ocel2(xes_path: str, ocel_path: str, memory_budget=None, n_jobs=1, soft_fraction=DEFAULT_SOFT_FRACTION, **params) -> dict:
+    """
+    params:
+    - xes_path: xes file path
+    - ocel_path: ocel2 output file path
+    - memory_budget: memory budget in bytes (default: container limit)
+    - n_jobs: number of worker processes if the budget allows it (default: 1)
+    - soft_fraction: share of the budget at which the parallel conversion falls back to a single process (default: 0.8)
+    - params: further xes_to_ocel2 parameters
+    """
+
+    num_events = estimate_xes_events(xes_path)
+    serial_bytes = num_events * XES_TO_OCEL2_EVENT_BYTES
+
+    # the workers hold their partitions and events in addition to the merged result
+    strategies = [('serial', lambda: xes_to_ocel2(xes_path, ocel_path, n_jobs=1, **params), serial_bytes)]
+    if n_jobs > 1:
+        strategies.insert(0, ('parallel', lambda: xes_to_ocel2(xes_path, ocel_path, n_jobs=n_jobs, **params), 2 * serial_bytes))
+    report = run_with_budget(strategies, memory_budget, soft_fraction)
+    report['estimated_events'] = num_events
+    return report
+
+if __name__ == "__main__":
+    report = governed_csv_to_xes('data/sample_data/csv_sample_simple.csv', 'data/generated_data/roundtrip/xes_from_csv_simple.xes')
+    print_governor_report(report)
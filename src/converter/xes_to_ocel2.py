@@ -3,6 +3,13 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import json
+from functools import partial
+from ocel2_sqlite import is_ocel2_sqlite, write_ocel2_sqlite, INITIAL_TIME
+from parallel_conversion import partition_by_case, map_partitions
+from lineage import save_lineage, group_positions
+from list_attributes import flatten_list_attributes
+
+CONVERTER_VERSION = '2'
 
 # helper function to ensure json conformity
 def convert_to_json_serializable(obj):
@@ -26,19 +33,216 @@ def convert_to_json_serializable(obj):
     else:
         return obj
 
+def get_attribute_type(val):
+    """
+    params:
+    - val: attribute value
+    """
+
+    # set attribute type based on python type
+    if hasattr(val, 'isoformat') or isinstance(val, pd.Timestamp):
+        return "string"  # convert timestamps to string
+    elif isinstance(val, bool) or isinstance(val, np.bool_):
+        return "boolean"
+    elif isinstance(val, (int, np.integer)):
+        return "integer"
+    elif isinstance(val, (float, np.floating)):
+        return "float"
+    else:
+        return "string"
+
+def convert_xes_frame(df: pd.DataFrame,
+                      case_object_type='case',
+                      resource_object_type='resource',
+                      resource_attr='org:resource',
+                      object_attribute_cols=None):
+    """
+    params:
+    - df: xes event data frame (or a partition of complete cases), the index is the event position
+    - case_object_type, resource_object_type, resource_attr: see xes_to_ocel2
+    - object_attribute_cols: columns that became case object attributes and are not repeated on the events (default: none)
+    """
+
+    excluded_cols = set(['concept:name', 'case:concept:name', 'time:timestamp', resource_attr] + (object_attribute_cols or []))
+
+    event_types = {}  # activity -> [first position, attribute name -> first (position, column index)]
+    attribute_types = {}  # attribute -> [first position, type]
+    events = []  # (position, event)
+
+    for position, row in df.iterrows():
+        activity = row.get('concept:name', 'unknown')
+
+        if activity not in event_types:
+            event_types[activity] = [position, {}]
+
+        # collect attribute types
+        for i, (col, val) in enumerate(row.items()):
+            if col not in excluded_cols:
+                if pd.notna(val):
+                    event_types[activity][1].setdefault(col, (position, i))
+                    if col not in attribute_types:
+                        attribute_types[col] = [position, get_attribute_type(val)]
+
+        case_id = str(row.get('case:concept:name', 'unknown'))
+        timestamp = row.get('time:timestamp', datetime.now())
+
+        event = {
+            "id": f"e{position}",
+            "type": str(activity),
+            "time": convert_to_json_serializable(timestamp),
+            "attributes": [],
+            "relationships": []
+        }
+
+        # create case relationship
+        event["relationships"].append({
+            "objectId": f"{case_object_type}_{case_id}",
+            "qualifier": case_object_type
+        })
+
+        # create resource relationship (if present)
+        resource_value = row.get(resource_attr)
+        if pd.notna(resource_value):
+            event["relationships"].append({
+                "objectId": f"{resource_object_type}_{resource_value}",
+                "qualifier": resource_object_type
+            })
+
+        # create event attributes from remaining columns
+        for col, val in row.items():
+            if col not in excluded_cols:
+                if pd.notna(val):
+                    val = convert_to_json_serializable(val)
+                    event["attributes"].append({
+                        "name": col,
+                        "value": val
+                    })
+
+        events.append((position, event))
+
+    return event_types, attribute_types, events
+
+def merge_converted_frames(results: list):
+    """
+    params:
+    - results: convert_xes_frame results of all partitions
+    """
+
+    # keep the entry with the smallest position, i.e. the one a single pass would have seen first
+    event_types = {}
+    attribute_types = {}
+    for partition_event_types, partition_attribute_types, _ in results:
+        for activity, (position, attributes) in partition_event_types.items():
+            if activity not in event_types:
+                event_types[activity] = [position, dict(attributes)]
+            else:
+                event_types[activity][0] = min(event_types[activity][0], position)
+                for col, attribute_position in attributes.items():
+                    if col not in event_types[activity][1] or attribute_position < event_types[activity][1][col]:
+                        event_types[activity][1][col] = attribute_position
+        for col, (position, attr_type) in partition_attribute_types.items():
+            if col not in attribute_types or position < attribute_types[col][0]:
+                attribute_types[col] = [position, attr_type]
+
+    # events in their original order
+    events = sorted((e for _, _, partition_events in results for e in partition_events), key=lambda e: e[0])
+
+    return dict(sorted(event_types.items(), key=lambda item: item[1][0])), attribute_types, events
+
+def get_object_attribute_columns(df: pd.DataFrame, resource_attr='org:resource', object_attributes=None) -> list:
+    """
+    params:
+    - df: xes event data frame
+    - resource_attr, object_attributes: see xes_to_ocel2
+    """
+
+    return [col for col in df.columns
+            if col not in ['concept:name', 'case:concept:name', 'time:timestamp', resource_attr]
+            and (col.startswith('case:') or col in (object_attributes or []))]
+
+def derive_object_enrichment(df: pd.DataFrame,
+                             resource_object_type='resource',
+                             resource_attr='org:resource',
+                             object_attributes=None):
+    """
+    params:
+    - df: xes event data frame, the index is the event position
+    - resource_object_type, resource_attr, object_attributes: see xes_to_ocel2
+    """
+
+    # case codes follow the order of df['case:concept:name'].unique(), i.e. the order of the case objects
+    case_codes, case_ids = pd.factorize(df['case:concept:name'], use_na_sentinel=False)
+    relationships = [[] for _ in case_ids]
+    attributes = [[] for _ in case_ids]
+    attribute_types = {}
+
+    # o2o: nonzero entries of the sparse case x resource incidence matrix, one code per (case, resource) pair
+    if resource_attr in df.columns:
+        resource_codes, resources = pd.factorize(df[resource_attr])
+        num_resources = max(len(resources), 1)
+        present = resource_codes >= 0
+        pairs = pd.unique(case_codes[present].astype(np.int64) * num_resources + resource_codes[present])
+        for case_code, resource_code in zip(pairs // num_resources, pairs % num_resources):
+            relationships[case_code].append({
+                "objectId": f"{resource_object_type}_{resources[resource_code]}",
+                "qualifier": resource_object_type
+            })
+
+    # events sorted by case and timestamp (stable, events without timestamp are not observations)
+    timestamps = df['time:timestamp'] if 'time:timestamp' in df.columns else pd.Series(pd.NaT, index=df.index)
+    has_time = timestamps.notna().to_numpy()
+    timestamp_keys = np.where(has_time, pd.to_datetime(timestamps, utc=True).to_numpy(dtype='datetime64[ns]').view(np.int64), 0)
+    order = np.lexsort((timestamp_keys, case_codes))
+    sorted_cases = case_codes[order]
+
+    # case attributes (and configured event attributes) become case object attributes: first value initial, then one change per new value
+    for col in get_object_attribute_columns(df, resource_attr, object_attributes):
+        value_codes = pd.factorize(df[col])[0][order]
+        observed = (value_codes >= 0) & has_time[order]
+        cases, codes, positions = sorted_cases[observed], value_codes[observed], order[observed]
+        if len(positions) == 0:
+            continue
+        is_first = np.r_[True, cases[1:] != cases[:-1]]
+        is_change = ~is_first & np.r_[False, codes[1:] != codes[:-1]]
+        keep = is_first | is_change
+
+        name = col[len('case:'):] if col.startswith('case:') else col
+        values = df[col].to_numpy()
+        attribute_types[name] = get_attribute_type(values[positions[0]])
+        kept = positions[keep]
+        for case_code, first, timestamp, value in zip(cases[keep], is_first[keep], timestamps.iloc[kept].tolist(), values[kept]):
+            attributes[case_code].append({
+                "name": name,
+                "time": INITIAL_TIME if first else convert_to_json_serializable(timestamp),
+                "value": convert_to_json_serializable(value)
+            })
+
+    return case_ids, relationships, attributes, attribute_types
+
 def xes_to_ocel2(xes_path, ocel_path, 
                  case_object_type='case',
                  resource_object_type='resource',
-                 resource_attr='org:resource'):
+                 resource_attr='org:resource',
+                 n_jobs=1,
+                 lineage_path=None,
+                 enrich_objects=False,
+                 object_attributes=None):
     """
     params:
-    - ocel2_path: ocel2 file path
-    - xes_path: xes output file path
+    - xes_path: xes file path
+    - ocel_path: ocel2 output file path ('.sqlite' writes OCEL2-SQLite, otherwise OCEL2-JSON)
+    - case_object_type: object type for cases (default: 'case')
+    - resource_object_type: object type for resources (default: 'resource')
+    - resource_attr: resource attribute of the events (default: 'org:resource')
+    - n_jobs: number of worker processes, the result is identical to n_jobs=1 (default: 1)
+    - lineage_path: writes the source event positions of each event and object to this .npz file (default: no lineage)
+    - enrich_objects: derives case-resource o2o relationships and case attributes with their changes from the events (default: False)
+    - object_attributes: event attributes that become case object attributes when enriching (default: only 'case:' attributes), enriched attributes are not repeated on the events
     """
     
     log = pm4py.read_xes(xes_path)
     
-    df = pm4py.convert_to_dataframe(log)
+    df = flatten_list_attributes(pm4py.convert_to_dataframe(log).reset_index(drop=True))
     
     # initialize OCEL2 structure
     ocel = {
@@ -51,35 +255,17 @@ def xes_to_ocel2(xes_path, ocel_path,
         "events": [],
         "objectRelations": []
     }
-    
-    event_types = {}
-    attribute_types = {}
-    
-    # identify activities and attribute types
-    for _, row in df.iterrows():
-        activity = row.get('concept:name', 'unknown')
-        
-        if activity not in event_types:
-            event_types[activity] = set()
-        
-        # collect attribute types
-        for col, val in row.items():
-            if col not in ['concept:name', 'case:concept:name', 'time:timestamp', resource_attr]:
-                if pd.notna(val):
-                    event_types[activity].add(col)
-                    # set attribute type based on python type
-                    if col not in attribute_types and pd.notna(val):
-                        test_val = val
-                        if hasattr(test_val, 'isoformat') or isinstance(test_val, pd.Timestamp):
-                            attribute_types[col] = "string"  # convert timestamps to string
-                        elif isinstance(test_val, bool) or isinstance(test_val, np.bool_):
-                            attribute_types[col] = "boolean"
-                        elif isinstance(test_val, (int, np.integer)):
-                            attribute_types[col] = "integer"
-                        elif isinstance(test_val, (float, np.floating)):
-                            attribute_types[col] = "float"
-                        else:
-                            attribute_types[col] = "string"
+
+    # identify activities and attribute types and create events (per partition of cases if parallel)
+    object_attribute_cols = get_object_attribute_columns(df, resource_attr, object_attributes) if enrich_objects else None
+    convert = partial(convert_xes_frame, case_object_type=case_object_type,
+                      resource_object_type=resource_object_type, resource_attr=resource_attr,
+                      object_attribute_cols=object_attribute_cols)
+    if n_jobs > 1:
+        partitions = partition_by_case(df, df['case:concept:name'], n_jobs)
+        event_types, attribute_types, events = merge_converted_frames(map_partitions(convert, partitions, n_jobs))
+    else:
+        event_types, attribute_types, events = merge_converted_frames([convert(df)])
     
     # create objects from uniquely identified resources
     resources_seen = set()
@@ -94,82 +280,61 @@ def xes_to_ocel2(xes_path, ocel_path,
             resources_seen.add(resource)
     
     # create objects from each case
-    for case_id in df['case:concept:name'].unique():
+    if enrich_objects:
+        case_ids, relationships, attributes, object_attribute_types = derive_object_enrichment(df, resource_object_type, resource_attr, object_attributes)
+        ocel["objectTypes"][0]["attributes"] = [{"name": name, "type": t} for name, t in object_attribute_types.items()]
+    else:
+        case_ids = df['case:concept:name'].unique()
+        relationships = [[] for _ in case_ids]
+        attributes = [[] for _ in case_ids]
+    for case_id, case_relationships, case_attributes in zip(case_ids, relationships, attributes):
         case_id = str(case_id)  # check for string
         ocel["objects"].append({
             "id": f"{case_object_type}_{case_id}",
             "type": case_object_type,
-            "attributes": [],
-            "relationships": []
+            "attributes": case_attributes,
+            "relationships": case_relationships
         })
     
-    event_counter = 0
-    # create events
-    for _, row in df.iterrows():
-        activity = str(row.get('concept:name', 'unknown'))
-        case_id = str(row.get('case:concept:name', 'unknown'))
-        timestamp = row.get('time:timestamp', datetime.now())
-        
-        event = {
-            "id": f"e{event_counter}",
-            "type": activity,
-            "time": convert_to_json_serializable(timestamp),
-            "attributes": [],
-            "relationships": []
-        }
-        
-        # create case relationship
-        event["relationships"].append({
-            "objectId": f"{case_object_type}_{case_id}",
-            "qualifier": case_object_type
-        })
-        
-        # create resource relationship (if present)
-        resource_value = row.get(resource_attr)
-        if pd.notna(resource_value):
-            event["relationships"].append({
-                "objectId": f"{resource_object_type}_{resource_value}",
-                "qualifier": resource_object_type
-            })
-        
-        # create event attributes from remaining columns
-        for col, val in row.items():
-            if col not in ['concept:name', 'case:concept:name', 'time:timestamp', resource_attr]:
-                if pd.notna(val):
-                    val = convert_to_json_serializable(val)
-                    event["attributes"].append({
-                        "name": col,
-                        "value": val
-                    })
-        
-        ocel["events"].append(event)
-        event_counter += 1
+    ocel["events"] = [event for _, event in events]
     
     # create event types
     final_event_types = []
-    for activity, attributes in event_types.items():
-        if isinstance(attributes, dict):
-            final_event_types.append(attributes)
-        else:
-            event_type_def = {
-                "name": activity,
-                "attributes": []
-            }
-            for attr in attributes:
-                event_type_def["attributes"].append({
-                    "name": attr,
-                    "type": attribute_types.get(attr, "string")
-                })
-            final_event_types.append(event_type_def)
+    for activity, (_, attributes) in event_types.items():
+        event_type_def = {
+            "name": activity,
+            "attributes": []
+        }
+        # attributes in the order they first occur, independent of the partitioning
+        for attr in sorted(attributes, key=attributes.get):
+            event_type_def["attributes"].append({
+                "name": attr,
+                "type": attribute_types.get(attr, [None, "string"])[1]
+            })
+        final_event_types.append(event_type_def)
     
     ocel["eventTypes"] = final_event_types
+
+    # events keep their position, objects map to the events of their resource (first) or case (second)
+    if lineage_path is not None:
+        # number of resources from the factorized values, so empty logs and logs without resources have none
+        resource_codes, resources = pd.factorize(df[resource_attr]) if resource_attr in df.columns else (np.full(len(df), -1), [])
+        case_codes, case_ids = pd.factorize(df['case:concept:name'], use_na_sentinel=False)
+        resource_offsets, resource_positions = group_positions(resource_codes, len(resources))
+        case_offsets, case_positions = group_positions(case_codes, len(case_ids))
+        save_lineage(lineage_path, [position for position, _ in events], len(df),
+                     np.concatenate([resource_offsets[:-1], case_offsets + resource_offsets[-1]]),
+                     np.concatenate([resource_positions, case_positions]))
     
     class NumpyEncoder(json.JSONEncoder):
         def default(self, obj):
             return convert_to_json_serializable(obj)
     
-    with open(ocel_path, 'w') as f:
-        json.dump(ocel, f, indent=2, cls=NumpyEncoder)
+    if is_ocel2_sqlite(ocel_path):
+        write_ocel2_sqlite(ocel, ocel_path)
+    else:
+        with open(ocel_path, 'w') as f:
+            json.dump(ocel, f, indent=2, cls=NumpyEncoder)
 
 if __name__ == "__main__":
     xes_to_ocel2('data/sample_data/xes_sample.xes', 'data/generated_data/xes_to_ocel2/ocel2_from_xes.json')
\ No newline at end of file
@@ -0,0 +1,64 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# 'thread' for i/o bound reads (e.g. csv), 'process' for gil bound parsing (e.g. xes xml, ocel2 json)
+LOAD_MODES = ['serial', 'thread', 'process']
+
+def timed_call(func, args: tuple):
+    """
+    params:
+    - func: load function (module level for mode 'process')
+    - args: arguments of the function
+    """
+
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def load_concurrently(tasks: dict, mode='thread'):
+    """
+    params:
+    - tasks: name -> (load function, arguments), e.g. {'source': (get_xes_metrics, (path,))}
+    - mode: 'serial', 'thread' or 'process' (default: 'thread')
+    """
+
+    if mode not in LOAD_MODES:
+        raise ValueError(f"Unbekannter Lademodus: {mode} (erlaubt: {LOAD_MODES})")
+
+    start = time.perf_counter()
+    if mode == 'serial' or len(tasks) < 2:
+        timed = {name: timed_call(func, args) for name, (func, args) in tasks.items()}
+    else:
+        executor_class = ThreadPoolExecutor if mode == 'thread' else ProcessPoolExecutor
+        with executor_class(max_workers=len(tasks)) as executor:
+            futures = {name: executor.submit(timed_call, func, args) for name, (func, args) in tasks.items()}
+            timed = {name: future.result() for name, future in futures.items()}
+    wall_time = time.perf_counter() - start
+
+    # overlap: 1 = wall time of the slowest load, 0 = sum of all loads (serial)
+    durations = {name: duration for name, (_, duration) in timed.items()}
+    serial_time = sum(durations.values())
+    slowest_time = max(durations.values(), default=0)
+    report = {
+        'mode': mode,
+        'durations': durations,
+        'wall_time': wall_time,
+        'serial_time': serial_time,
+        'slowest_time': slowest_time,
+        'speedup': serial_time / wall_time if wall_time > 0 else 1,
+        'overlap': min(max((serial_time - wall_time) / (serial_time - slowest_time), 0), 1) if serial_time > slowest_time else 1
+    }
+
+    return {name: result for name, (result, _) in timed.items()}, report
+
+def print_load_report(report: dict):
+    """
+    params:
+    - report: load report (load_concurrently)
+    """
+
+    print(f"\nLADEZEIT ({report['mode']}):")
+    for name, duration in report['durations'].items():
+        print(f"  {name}: {duration:.2f}s")
+    print(f"  Gesamt: {report['wall_time']:.2f}s (seriell {report['serial_time']:.2f}s, langsamste Quelle {report['slowest_time']:.2f}s)")
+    print(f"  Überlappung: {report['overlap']:.1%}, Speedup: {report['speedup']:.2f}x")
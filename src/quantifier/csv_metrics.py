@@ -1,9 +1,13 @@
 import pandas as pd
+from temporal_metrics import get_case_durations, describe_distribution
+from timestamp_parsing import parse_timestamps, get_format_cache_key, get_time_range_hours
 
-def get_csv_metrics(file_path):
+def get_csv_metrics(file_path, timestamp_format=None, df=None):
     """
     params:
     - file_path: CSV file path
+    - timestamp_format: format of the timestamps (default: detected once per file and cached)
+    - df: already loaded frame of the file, it is not modified (default: read from file_path)
     """
 
     # define column names for mandatory columns
@@ -11,7 +15,8 @@ def get_csv_metrics(file_path):
     activity_column = "activity"
     timestamp_column = "timestamp"
     
-    df = pd.read_csv(file_path)
+    if df is None:
+        df = pd.read_csv(file_path)
     
     # validate form
     required_columns = [case_column, activity_column, timestamp_column]
@@ -19,21 +24,24 @@ def get_csv_metrics(file_path):
     if missing:
         raise ValueError(f"Spalten fehlen: {missing}")
     
-    # declare empty case_ids to SYSTEM
-    df[case_column] = df[case_column].fillna('SYSTEM').astype(str)
-    df.loc[df[case_column].str.strip() == '', case_column] = 'SYSTEM'
+    # declare empty case_ids to SYSTEM (on a copy of the column, the frame stays raw for other analyses)
+    case_ids = df[case_column].fillna('SYSTEM').astype(str)
+    case_ids[case_ids.str.strip() == ''] = 'SYSTEM'
 
-    df[timestamp_column] = pd.to_datetime(df[timestamp_column])
+    parsed = parse_timestamps(df[timestamp_column], timestamp_format, get_format_cache_key(file_path, timestamp_column))
+    timestamps = parsed['timestamps']
     
     # calculate basic statistics
     num_events = len(df)
     num_activities = df[activity_column].nunique()
-    num_cases = df[case_column].nunique()
+    num_cases = case_ids.nunique()
     
     # calculate processing time
-    time_min = df[timestamp_column].min()
-    time_max = df[timestamp_column].max()
-    time_range_hours = (time_max - time_min).total_seconds() / 3600
+    time_range_hours = get_time_range_hours(timestamps)
+
+    # calculate case durations and inter-event times
+    durations = get_case_durations(case_ids, timestamps)
+    avg_case_duration_hours = float(durations['case_durations_hours'].mean()) if num_cases > 0 else 0
     
     # calculate event attributes (and resources)
     attribute_columns = [col for col in df.columns if col not in required_columns]
@@ -75,6 +83,11 @@ def get_csv_metrics(file_path):
             "num_activities": num_activities,
             "num_event_attributes": num_event_attributes,
             "num_multi_attributes": num_multi_attributes,
-            "time_range_hours": time_range_hours
+            "time_range_hours": time_range_hours,
+            "timestamp_format": parsed['format'],
+            "num_unparseable_timestamps": parsed['num_unparseable'],
+            "avg_case_duration_hours": avg_case_duration_hours,
+            "case_duration_distribution": describe_distribution(durations['case_durations_hours']),
+            "inter_event_time_distribution": describe_distribution(durations['inter_event_times_hours'])
         }
     }
\ No newline at end of file
@@ -1,24 +1,40 @@
 import pandas as pd  
 from typing import Dict, Any  
 from csv_metrics import get_csv_metrics
+from temporal_metrics import distribution_similarity
+from lineage_metrics import load_lineage, compose_lineage, get_lineage_metrics
+from metadata_reader import read_csv_metadata, get_frame_metadata
+from concurrent_loader import load_concurrently, print_load_report
+from scoring_kernel import score_pair, csv_roundtrip_subscores, CSV_ROUNDTRIP_DIMENSIONS, CSV_ROUNDTRIP_WEIGHTS, LINEAGE_SUBSCORES
 
-def csv_roundtrip_quantifier(original_csv_path: str, roundtrip_csv_path: str) -> Dict[str, Any]:  
+def csv_roundtrip_quantifier(original_csv_path: str, roundtrip_csv_path: str, lineage_paths=None, load_mode='thread') -> Dict[str, Any]:  
     """
     params:
     - original_csv_path: starting CSV file path
     - roundtrip_csv_path: file path of CSV after roundtrip
+    - lineage_paths: lineage files of all roundtrip steps in order, enables exact event metrics (default: counts only)
+    - load_mode: reads both files concurrently ('thread', 'process') or one after the other ('serial') (default: 'thread')
     """
 
-    original_metrics = get_csv_metrics(original_csv_path)['stats']  
-    roundtrip_metrics = get_csv_metrics(roundtrip_csv_path)['stats']  
+    # each file is read once, metrics, schema and data quality are computed from the same frame
+    loaded, load_report = load_concurrently({
+        'original_frame': (pd.read_csv, (original_csv_path,)),
+        'roundtrip_frame': (pd.read_csv, (roundtrip_csv_path,))
+    }, load_mode)
+    original_frame, roundtrip_frame = loaded['original_frame'], loaded['roundtrip_frame']
+    original_metrics = get_csv_metrics(original_csv_path, df=original_frame)['stats']  
+    roundtrip_metrics = get_csv_metrics(roundtrip_csv_path, df=roundtrip_frame)['stats']  
        
-    preservation_metrics = calculate_preservation_metrics(original_metrics, roundtrip_metrics)  
+    # exact event mapping over all roundtrip steps instead of comparing counts
+    lineage_metrics = None
+    if lineage_paths:
+        lineage_metrics = get_lineage_metrics(compose_lineage(*[load_lineage(p) for p in lineage_paths]))
  
-    structural_analysis = analyze_structural_differences(original_csv_path, roundtrip_csv_path)  
+    structural_analysis = analyze_structural_differences(original_csv_path, roundtrip_csv_path, df_original=original_frame, df_roundtrip=roundtrip_frame)  
       
-    data_quality = analyze_data_quality(original_csv_path, roundtrip_csv_path)  
+    data_quality = analyze_data_quality(original_csv_path, roundtrip_csv_path, original_frame, roundtrip_frame)  
       
-    overall_score = calculate_roundtrip_score(preservation_metrics, structural_analysis, data_quality)  
+    preservation_metrics, overall_score = calculate_roundtrip_scores(original_metrics, roundtrip_metrics, structural_analysis, data_quality, lineage_metrics)  
       
     results = {  
         'original_metrics': original_metrics,  
@@ -27,62 +43,30 @@ def csv_roundtrip_quantifier(original_csv_path: str, roundtrip_csv_path: str) ->
         'structural_analysis': structural_analysis,  
         'data_quality_analysis': data_quality,  
         'overall_roundtrip_score': overall_score,  
+        'lineage_metrics': lineage_metrics,
+        'load_report': load_report,
         'insights': generate_roundtrip_insights(preservation_metrics, structural_analysis, data_quality)  
     }  
       
     print_roundtrip_analysis(results)  
     return results  
   
-def calculate_preservation_metrics(original_metrics: Dict, roundtrip_metrics: Dict) -> Dict[str, float]:  
-    """
-    params:
-    - original_metrics: starting CSV file metrics
-    - roundtrip_metrics: roundtrip CSV file metrics
-    """
-    
-    # any deviation of 1 (100% preservation) affects the score negatively
-    case_preservation = 1 - abs(1 - (roundtrip_metrics['num_cases'] / original_metrics['num_cases'])) if original_metrics['num_cases'] > 0 else 0  
-    event_preservation = 1 - abs(1 - (roundtrip_metrics['num_events'] / original_metrics['num_events'])) if original_metrics['num_events'] > 0 else 0  
-    activity_preservation = 1 - abs(1 - (roundtrip_metrics['num_activities'] / original_metrics['num_activities'])) if original_metrics['num_activities'] > 0 else 0  
-    attribute_preservation = 1 - abs(1 - (roundtrip_metrics['num_event_attributes'] / original_metrics['num_event_attributes'])) if original_metrics['num_event_attributes'] > 0 else 0 
-        
-    avg_events_per_case_preservation = (  
-        1 - abs(1 - roundtrip_metrics['avg_events_per_case'] / original_metrics['avg_events_per_case'])
-        if original_metrics['avg_events_per_case'] > 0 else 0  
-    )  
-        
-    multi_attr_preservation = (  
-        1 - abs(1 - roundtrip_metrics['num_multi_attributes'] / original_metrics['num_multi_attributes'])   
-        if original_metrics['num_multi_attributes'] > 0 else 1.0  
-    )  
-        
-    time_range_preservation = (  
-        1 - abs(1 - roundtrip_metrics['time_range_hours'] / original_metrics['time_range_hours'])
-        if original_metrics['time_range_hours'] > 0 else 1.0  
-    )  
-      
-    return {  
-        'case_preservation_ratio': float(case_preservation),  
-        'event_preservation_ratio': float(event_preservation),  
-        'activity_preservation_ratio': float(activity_preservation),  
-        'attribute_preservation_ratio': float(attribute_preservation),  
-        'avg_events_per_case_preservation': float(avg_events_per_case_preservation),  
-        'multi_attribute_preservation': float(multi_attr_preservation),  
-        'time_range_preservation': float(time_range_preservation)  
-    }  
-  
-def analyze_structural_differences(original_path: str, roundtrip_path: str) -> Dict[str, Any]:  
+def analyze_structural_differences(original_path: str, roundtrip_path: str, sample_rows=None, df_original=None, df_roundtrip=None) -> Dict[str, Any]:  
     """
     params:
     - original_path: starting CSV file path
     - roundtrip_path: roundtrip CSV file path
+    - sample_rows: number of rows used for dtype inference if no frames are given (default: None reads all rows;
+      a sample, e.g. DEFAULT_SAMPLE_ROWS, is faster but misses dtype changes after it, e.g. NaNs turning int into float)
+    - df_original, df_roundtrip: already loaded frames of both files, dtypes are taken from them (default: read from the paths)
     """
       
-    df_original = pd.read_csv(original_path)  
-    df_roundtrip = pd.read_csv(roundtrip_path)  
+    # dtypes of the full frames if loaded anyway, otherwise header plus sample_rows rows
+    original_metadata = get_frame_metadata(df_original) if df_original is not None else read_csv_metadata(original_path, sample_rows)  
+    roundtrip_metadata = get_frame_metadata(df_roundtrip) if df_roundtrip is not None else read_csv_metadata(roundtrip_path, sample_rows)  
       
-    original_columns = set(df_original.columns)  
-    roundtrip_columns = set(df_roundtrip.columns)  
+    original_columns = set(original_metadata['columns'])  
+    roundtrip_columns = set(roundtrip_metadata['columns'])  
     
     # calculate structural differences
     added_columns = roundtrip_columns - original_columns  
@@ -92,8 +76,8 @@ def analyze_structural_differences(original_path: str, roundtrip_path: str) -> D
     # calculate data type changes  
     dtype_changes = {}  
     for col in preserved_columns: 
-        orig_dtype = str(df_original[col].dtype)  
-        round_dtype = str(df_roundtrip[col].dtype)  
+        orig_dtype = original_metadata['dtypes'][col]  
+        round_dtype = roundtrip_metadata['dtypes'][col]  
         if orig_dtype != round_dtype:  
             dtype_changes[col] = {'original': orig_dtype, 'roundtrip': round_dtype}
     
@@ -111,15 +95,18 @@ def analyze_structural_differences(original_path: str, roundtrip_path: str) -> D
         'column_count_change': len(roundtrip_columns) - len(original_columns)  
     }  
   
-def analyze_data_quality(original_path: str, roundtrip_path: str) -> Dict[str, Any]:  
+def analyze_data_quality(original_path: str, roundtrip_path: str, df_original=None, df_roundtrip=None) -> Dict[str, Any]:  
     """
     params:
     - original_path: starting CSV file path
     - roundtrip_path: roundtrip CSV file path
+    - df_original, df_roundtrip: already loaded frames of both files (default: read from the paths)
     """ 
       
-    df_original = pd.read_csv(original_path)  
-    df_roundtrip = pd.read_csv(roundtrip_path)  
+    if df_original is None:
+        df_original = pd.read_csv(original_path)  
+    if df_roundtrip is None:
+        df_roundtrip = pd.read_csv(roundtrip_path)  
       
     # Gemeinsame Spalten für Vergleich  
     common_columns = set(df_original.columns) & set(df_roundtrip.columns)  
@@ -151,37 +138,41 @@ def analyze_data_quality(original_path: str, roundtrip_path: str) -> Dict[str, A
         'unique_values_analysis': sum(unique_values_preserved) / sum(orig_unique_total) 
     }  
   
-def calculate_roundtrip_score(preservation: Dict, structural: Dict, quality: Dict) -> Dict[str, Any]:  
+def calculate_roundtrip_scores(original_metrics: Dict, roundtrip_metrics: Dict, structural: Dict, quality: Dict, lineage_metrics=None):  
     """
     params:
-    - preservation: preservation dic scores
-    - structural: preservation dic scores
+    - original_metrics: starting CSV file metrics
+    - roundtrip_metrics: roundtrip CSV file metrics
+    - structural: structural dic scores
     - quality: quality dic scores
+    - lineage_metrics: lineage metrics of all roundtrip steps (default: counts only)
     """ 
 
-    # calculate mean for each part score  
-    preservation_score = float((  
-        preservation['case_preservation_ratio'] +  
-        preservation['event_preservation_ratio'] +  
-        preservation['activity_preservation_ratio'] +  
-        preservation['attribute_preservation_ratio'] +  
-        preservation['avg_events_per_case_preservation'] +
-        preservation['multi_attribute_preservation'] +
-        preservation['time_range_preservation'] 
-    ) / 7)
-      
-    structural_score = float((structural['schema_preservation_ratio'] + structural['dtype_preservation_ratio']) / 2)
+    # compare the full distributions instead of single averages
+    precomputed = {
+        'case_duration_similarity': distribution_similarity(
+            original_metrics['case_duration_distribution'], roundtrip_metrics['case_duration_distribution']),
+        'inter_event_time_similarity': distribution_similarity(
+            original_metrics['inter_event_time_distribution'], roundtrip_metrics['inter_event_time_distribution'])
+    }
+    for key in CSV_ROUNDTRIP_DIMENSIONS['structural'][0]:
+        precomputed[key] = structural[key]
+    for key in CSV_ROUNDTRIP_DIMENSIONS['quality'][0]:
+        precomputed[key] = quality[key]
+    if lineage_metrics is not None:
+        for name in LINEAGE_SUBSCORES:
+            precomputed[f"lineage:{name}"] = lineage_metrics[name]
 
-    quality_score = float((quality['null_values_analysis'] + quality['unique_values_analysis']) / 2)
-
-    # weighted total score
-    overall_score = (preservation_score * 0.6 + structural_score * 0.3 + quality_score * 0.1)  
-      
-    return {  
-        'overall_roundtrip_score': float(overall_score), 
-        'preservation_contribution': float(preservation_score * 0.6),  
-        'structural_contribution': float(structural_score * 0.3),  
-        'quality_contribution': float(quality_score * 0.1)  
+    # mean per part score and weighted total (formulas in scoring_kernel)
+    scores = score_pair(csv_roundtrip_subscores, CSV_ROUNDTRIP_DIMENSIONS, original_metrics, roundtrip_metrics, precomputed, CSV_ROUNDTRIP_WEIGHTS)
+    preservation = {k: scores['subscores'][k] for k in CSV_ROUNDTRIP_DIMENSIONS['preservation'][0]}
+    contributions = {dim: scores['dimension_scores'][dim] * weight for dim, weight in CSV_ROUNDTRIP_WEIGHTS.items()}
+      
+    return preservation, {  
+        'overall_roundtrip_score': scores['total_score'], 
+        'preservation_contribution': contributions['preservation'],  
+        'structural_contribution': contributions['structural'],  
+        'quality_contribution': contributions['quality']  
     }  
   
 def generate_roundtrip_insights(preservation: Dict, structural: Dict, quality: Dict) -> list:  
@@ -217,6 +208,7 @@ def print_roundtrip_analysis(results: Dict):
     print(f"  Events: {orig['num_events']} → {round_trip['num_events']}")  
     print(f"  Aktivitäten: {orig['num_activities']} → {round_trip['num_activities']}")  
     print(f"  Event-Attribute: {orig['num_event_attributes']} → {round_trip['num_event_attributes']}")  
+    print(f"  Nicht lesbare Timestamps: {orig['num_unparseable_timestamps']} → {round_trip['num_unparseable_timestamps']}")
       
     print(f"\nPRESERVATION-ANALYSE:")  
     pres = results['preservation_analysis']
@@ -227,6 +219,12 @@ def print_roundtrip_analysis(results: Dict):
     print(f"  Durchschnittlice Events/Case-Preservation: {pres['avg_events_per_case_preservation']:.1%}")
     print(f"  Multi-Attribute-Preservation: {pres['multi_attribute_preservation']:.1%}")
     print(f"  Prozesszeit-Preservation: {pres['time_range_preservation']:.1%}") 
+    print(f"  Case-Dauer-Verteilung: {pres['case_duration_similarity']:.1%}")
+    print(f"  Zwischenereigniszeit-Verteilung: {pres['inter_event_time_similarity']:.1%}")
+    if results['lineage_metrics'] is not None:
+        lineage = results['lineage_metrics']
+        print(f"  Events verloren (Lineage): {lineage['event_loss']:.1%}")
+        print(f"  Events dupliziert (Lineage): {lineage['event_duplication']:.1%}")
       
     print(f"\nSTRUKTURELLE ANALYSE:")  
     struct = results['structural_analysis']
@@ -244,6 +242,8 @@ def print_roundtrip_analysis(results: Dict):
     for insight in results['insights']:  
         print(f"  {insight}")
 
+    print_load_report(results['load_report'])
+
     print(f"\nGESAMTBEWERTUNG:")  
     overall = results['overall_roundtrip_score']  
     print(f"  Gesamtscore: {overall['overall_roundtrip_score']:.3f}") 
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+from typing import Dict
+
+# above this many possible edges the dense bincount table gets too large
+MAX_DENSE_EDGES = 2 ** 24
+
+def compute_dfg(case_ids, activities, timestamps, object_types=None) -> pd.DataFrame:
+    """
+    params:
+    - case_ids: case id (or object id) of each event
+    - activities: activity of each event
+    - timestamps: timestamp of each event
+    - object_types: object type of each case id (optional, OCEL2 only)
+    """
+
+    # encode everything as integer codes (missing values become -1)
+    case_codes = pd.factorize(np.asarray(case_ids, dtype=object))[0]
+    activity_codes, activity_labels = pd.factorize(np.asarray(activities, dtype=object))
+    time_values = pd.DatetimeIndex(pd.to_datetime(pd.Series(timestamps), utc=True)).asi8
+    num_activities = max(len(activity_labels), 1)
+
+    if object_types is not None:
+        type_codes, type_labels = pd.factorize(np.asarray(object_types, dtype=object))
+    else:
+        type_codes, type_labels = np.zeros(len(case_codes), dtype=np.int64), np.array([None])
+    num_types = len(type_labels)
+
+    # order events by case and timestamp, skip sorting if the log is already ordered
+    same_case = case_codes[1:] == case_codes[:-1]
+    is_sorted = np.all((case_codes[1:] > case_codes[:-1]) | (same_case & (time_values[1:] >= time_values[:-1])))
+    if not is_sorted:
+        order = np.lexsort((time_values, case_codes))
+        case_codes = case_codes[order]
+        activity_codes = activity_codes[order]
+        type_codes = type_codes[order]
+        same_case = case_codes[1:] == case_codes[:-1]
+
+    # directly-follows pairs are neighbouring events of the same case
+    valid = same_case & (case_codes[1:] >= 0) & (activity_codes[:-1] >= 0) & (activity_codes[1:] >= 0)
+    pair_codes = (type_codes[1:][valid].astype(np.int64) * num_activities
+                  + activity_codes[:-1][valid]) * num_activities + activity_codes[1:][valid]
+
+    num_possible_edges = num_types * num_activities * num_activities
+    if num_possible_edges <= MAX_DENSE_EDGES:
+        counts = np.bincount(pair_codes, minlength=num_possible_edges)
+        edge_codes = np.flatnonzero(counts)
+        frequencies = counts[edge_codes]
+    else:
+        edge_codes, frequencies = np.unique(pair_codes, return_counts=True)
+
+    # decode pair codes back into labels
+    edge_types, remainder = np.divmod(edge_codes, num_activities * num_activities)
+    source_codes, target_codes = np.divmod(remainder, num_activities)
+
+    dfg = pd.DataFrame({
+        'source': activity_labels[source_codes],
+        'target': activity_labels[target_codes],
+        'frequency': frequencies.astype(np.int64)
+    })
+    if object_types is not None:
+        dfg.insert(0, 'object_type', type_labels[edge_types])
+
+    return dfg
+
+def aggregate_dfg(dfg: pd.DataFrame, object_types=None) -> pd.DataFrame:
+    """
+    params:
+    - dfg: directly-follows graph (see compute_dfg)
+    - object_types: object types to keep (default: all)
+    """
+
+    if 'object_type' not in dfg.columns:
+        return dfg
+    if object_types is not None:
+        dfg = dfg[dfg['object_type'].isin(object_types)]
+
+    # sum up the frequencies of identical edges over all object types
+    return dfg.groupby(['source', 'target'], as_index=False, sort=False)['frequency'].sum()
+
+def compare_dfgs(source_dfg: pd.DataFrame, target_dfg: pd.DataFrame) -> Dict[str, float]:
+    """
+    params:
+    - source_dfg: directly-follows graph before the transformation
+    - target_dfg: directly-follows graph after the transformation
+    """
+
+    source_dfg = aggregate_dfg(source_dfg)
+    target_dfg = aggregate_dfg(target_dfg)
+
+    edges = pd.merge(source_dfg, target_dfg, on=['source', 'target'], how='outer', suffixes=('_source', '_target'))
+    source_freq = edges['frequency_source'].fillna(0).to_numpy(dtype=float)
+    target_freq = edges['frequency_target'].fillna(0).to_numpy(dtype=float)
+
+    # edge recall/precision only consider whether an edge exists
+    common_edges = np.count_nonzero((source_freq > 0) & (target_freq > 0))
+    num_source_edges = np.count_nonzero(source_freq)
+    num_target_edges = np.count_nonzero(target_freq)
+    edge_recall = common_edges / num_source_edges if num_source_edges > 0 else 1.0
+    edge_precision = common_edges / num_target_edges if num_target_edges > 0 else 1.0
+
+    # frequency-weighted distance (total variation of the relative edge frequencies)
+    if source_freq.sum() > 0 and target_freq.sum() > 0:
+        frequency_distance = 0.5 * np.abs(source_freq / source_freq.sum() - target_freq / target_freq.sum()).sum()
+    else:
+        frequency_distance = 0.0 if source_freq.sum() == target_freq.sum() else 1.0
+
+    return {
+        'dfg_edge_recall': float(edge_recall),
+        'dfg_edge_precision': float(edge_precision),
+        'dfg_frequency_fidelity': float(1 - frequency_distance)
+    }
@@ -0,0 +1,59 @@
+import numpy as np
+
+def load_lineage(lineage_path: str) -> dict:
+    """
+    params:
+    - lineage_path: lineage file path (.npz written by a converter)
+    """
+
+    with np.load(lineage_path) as data:
+        return {k: data[k] for k in data.files}
+
+def compose_lineage(*lineages) -> dict:
+    """
+    params:
+    - lineages: lineages of consecutive conversions (e.g. csv -> xes, xes -> ocel2, ocel2 -> csv)
+    """
+
+    # the source positions of each step are output positions of the previous step
+    event_source_index = lineages[-1]['event_source_index']
+    for lineage in reversed(lineages[:-1]):
+        event_source_index = lineage['event_source_index'][event_source_index]
+    return {
+        'event_source_index': event_source_index,
+        'num_source_events': lineages[0]['num_source_events']
+    }
+
+def get_lineage_metrics(lineage: dict) -> dict:
+    """
+    params:
+    - lineage: loaded (or composed) lineage
+    """
+
+    num_source = int(lineage['num_source_events'])
+    event_source_index = lineage['event_source_index']
+    num_output = len(event_source_index)
+
+    # number of output events per source event (0 = lost, >1 = duplicated)
+    fanout = np.bincount(event_source_index, minlength=num_source)
+    num_preserved = int(np.count_nonzero(fanout))
+
+    metrics = {
+        'num_source_events': num_source,
+        'num_output_events': num_output,
+        'event_coverage': num_preserved / num_source if num_source > 0 else 1,
+        'event_loss': 1 - num_preserved / num_source if num_source > 0 else 0,
+        'event_duplication': (num_output - num_preserved) / num_output if num_output > 0 else 0,
+        'event_preservation': (num_preserved / num_source) * (num_preserved / num_output) if num_source > 0 and num_output > 0 else 0,
+        'num_duplicated_source_events': int(np.count_nonzero(fanout > 1)),
+        'max_event_fanout': int(fanout.max()) if num_source > 0 else 0
+    }
+
+    # objects: share of source events covered by at least one object
+    if 'object_offsets' in lineage:
+        covered = np.zeros(num_source, dtype=bool)
+        covered[lineage['object_source_index']] = True
+        metrics['num_output_objects'] = len(lineage['object_offsets']) - 1
+        metrics['object_event_coverage'] = covered.mean() if num_source > 0 else 1
+
+    return metrics
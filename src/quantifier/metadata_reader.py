@@ -0,0 +1,203 @@
+import json
+import re
+import sqlite3
+import pandas as pd
+from ocel2_sqlite_metrics import get_attribute_columns
+from shared_tables import is_shared_table, read_table_metadata
+
+# number of csv rows used for dtype inference
+DEFAULT_SAMPLE_ROWS = 1000
+
+# number of characters read at once by the ocel2 json scanner
+JSON_CHUNK_SIZE = 65536
+
+# tokens relevant for skipping json values (brackets and string starts)
+JSON_STRUCTURE = re.compile(r'[\[\]{}"]')
+JSON_STRING_END = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+
+def read_csv_metadata(csv_path: str, sample_rows=DEFAULT_SAMPLE_ROWS) -> dict:
+    """
+    params:
+    - csv_path: CSV file path
+    - sample_rows: number of rows used for dtype inference (default: 1000, None reads all rows)
+    """
+
+    return get_frame_metadata(pd.read_csv(csv_path, nrows=sample_rows))
+
+def get_frame_metadata(df: pd.DataFrame) -> dict:
+    """
+    params:
+    - df: csv frame (or a sample of it)
+    """
+
+    return {
+        'columns': list(df.columns),
+        'dtypes': {col: str(dtype) for col, dtype in df.dtypes.items()},
+        'num_sample_rows': len(df)
+    }
+
+def read_json_chunk(f, buffer: str, pos: int):
+    """
+    params:
+    - f: opened json file
+    - buffer: unconsumed characters
+    - pos: position in the buffer
+    """
+
+    # drop consumed characters so that the buffer stays bounded
+    chunk = f.read(JSON_CHUNK_SIZE)
+    if not chunk:
+        raise ValueError("Unerwartetes Dateiende im OCEL2-JSON.")
+    return buffer[pos:] + chunk, 0
+
+def skip_json_whitespace(f, buffer: str, pos: int, skip=' \t\r\n'):
+    """
+    params:
+    - f: opened json file
+    - buffer: unconsumed characters
+    - pos: position in the buffer
+    - skip: characters to skip (default: whitespace)
+    """
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in skip:
+            pos += 1
+        if pos < len(buffer):
+            return buffer, pos
+        buffer, pos = read_json_chunk(f, buffer, pos)
+
+def decode_json_value(f, decoder: json.JSONDecoder, buffer: str, pos: int):
+    """
+    params:
+    - f: opened json file
+    - decoder: json decoder
+    - buffer: unconsumed characters
+    - pos: position of the value in the buffer
+    """
+
+    # read more until the complete value is in the buffer
+    while True:
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+            # a number at the end of the buffer may continue in the next chunk
+            if end < len(buffer):
+                return value, buffer, end
+        except json.JSONDecodeError:
+            pass
+        try:
+            buffer, pos = read_json_chunk(f, buffer, pos)
+        except ValueError:
+            value, end = decoder.raw_decode(buffer, pos)
+            return value, buffer, end
+
+def skip_json_value(f, decoder: json.JSONDecoder, buffer: str, pos: int):
+    """
+    params:
+    - f: opened json file
+    - decoder: json decoder
+    - buffer: unconsumed characters
+    - pos: position of the value in the buffer
+    """
+
+    if buffer[pos] not in '[{':
+        _, buffer, pos = decode_json_value(f, decoder, buffer, pos)
+        return buffer, pos
+
+    # count brackets outside of strings without building python objects
+    depth = 0
+    while True:
+        match = JSON_STRUCTURE.search(buffer, pos)
+        if match is None:
+            buffer, pos = read_json_chunk(f, buffer, len(buffer))
+            continue
+        char, pos = match.group(), match.end()
+        if char == '"':
+            end = JSON_STRING_END.match(buffer, pos)
+            while end is None:
+                buffer, pos = read_json_chunk(f, buffer, pos)
+                end = JSON_STRING_END.match(buffer, pos)
+            pos = end.end()
+        elif char in '[{':
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return buffer, pos
+
+def read_json_sections(json_path: str, sections: list) -> dict:
+    """
+    params:
+    - json_path: JSON file path (object at top level)
+    - sections: top-level keys to decode, all other values are skipped
+    """
+
+    decoder = json.JSONDecoder()
+    result = {}
+    with open(json_path, encoding='utf-8') as f:
+        buffer, pos = skip_json_whitespace(f, '', 0)
+        if buffer[pos] != '{':
+            raise ValueError("OCEL2-JSON muss ein Objekt enthalten.")
+        pos += 1
+
+        # stop as soon as all sections are found (type sections usually precede events and objects)
+        while len(result) < len(sections):
+            buffer, pos = skip_json_whitespace(f, buffer, pos, ' \t\r\n,')
+            if buffer[pos] == '}':
+                break
+            key, buffer, pos = decode_json_value(f, decoder, buffer, pos)
+            buffer, pos = skip_json_whitespace(f, buffer, pos, ' \t\r\n:')
+            if key in sections:
+                result[key], buffer, pos = decode_json_value(f, decoder, buffer, pos)
+            else:
+                buffer, pos = skip_json_value(f, decoder, buffer, pos)
+    return result
+
+def read_ocel2_metadata(ocel2_path: str) -> dict:
+    """
+    params:
+    - ocel2_path: OCEL2 file path (JSON or SQLite)
+    """
+
+    # shared tables keep the path of the file they were materialized from
+    if is_shared_table(ocel2_path):
+        ocel2_path = read_table_metadata(ocel2_path)['source']
+
+    if str(ocel2_path).lower().endswith('.sqlite'):
+        conn = sqlite3.connect(ocel2_path)
+        existing_tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        types = {}
+        for kind in ['event', 'object']:
+            types[kind] = [
+                {'name': name, 'attributes': [{'name': a} for a in sorted(get_attribute_columns(conn, f"{kind}_{table}"))]}
+                for name, table in conn.execute(f'SELECT "ocel_type", "ocel_type_map" FROM "{kind}_map_type"')
+                if f"{kind}_{table}" in existing_tables
+            ]
+        conn.close()
+        event_types, object_types = types['event'], types['object']
+    else:
+        sections = read_json_sections(ocel2_path, ['eventTypes', 'objectTypes'])
+        event_types, object_types = sections.get('eventTypes', []), sections.get('objectTypes', [])
+
+    return {
+        'event_types': [t['name'] for t in event_types],
+        'object_types': [t['name'] for t in object_types],
+        'event_attributes': sorted({a['name'] for t in event_types for a in t.get('attributes', [])}),
+        'object_attributes': sorted({a['name'] for t in object_types for a in t.get('attributes', [])}),
+        'event_type_definitions': event_types,
+        'object_type_definitions': object_types
+    }
+
+def get_ocel2_structure(ocel2_path: str) -> dict:
+    """
+    params:
+    - ocel2_path: OCEL2 file path (JSON, SQLite or shared tables)
+    """
+
+    # structural counts from the declared types, without parsing events and objects
+    metadata = read_ocel2_metadata(ocel2_path)
+    return {
+        'num_event_types': len(metadata['event_types']),
+        'num_object_types': len(metadata['object_types']),
+        'num_event_attributes': len(metadata['event_attributes']),
+        'num_object_attributes': len(metadata['object_attributes'])
+    }
@@ -0,0 +1,64 @@
+import os
+import sys
+from xes_metrics import get_xes_metrics
+from ocel2_metrics import get_ocel2_metrics
+from shared_tables import is_shared_table
+
+# the budget machinery is shared with the converters (resource_governor)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'converter'))
+from memory_budget import run_with_budget, print_governor_report, DEFAULT_SOFT_FRACTION
+
+# peak memory per byte of input above the interpreter baseline (measured with get_xes_metrics / get_ocel2_metrics)
+XES_PARSE_FILE_FACTOR = 6
+OCEL2_PARSE_FILE_FACTOR = 9
+SHARED_TABLE_FILE_FACTOR = 8
+OCEL2_SQLITE_FILE_FACTOR = 1
+
+def get_path_size(path: str) -> int:
+    """
+    params:
+    - path: file or directory (e.g. shared tables)
+    """
+
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+def governed_xes_metrics(xes_path: str, memory_budget=None, table_dir=None, soft_fraction=DEFAULT_SOFT_FRACTION) -> dict:
+    """
+    params:
+    - xes_path: XES file path
+    - memory_budget: memory budget in bytes (default: container limit)
+    - table_dir: shared tables of the same log (materialize_xes), attached if parsing does not fit (default: none)
+    - soft_fraction: share of the budget at which parsing falls back to the shared tables (default: 0.8)
+    """
+
+    strategies = [('parse', lambda: get_xes_metrics(xes_path), get_path_size(xes_path) * XES_PARSE_FILE_FACTOR)]
+    if table_dir is not None and is_shared_table(table_dir):
+        strategies.append(('shared_tables', lambda: get_xes_metrics(table_dir), get_path_size(table_dir) * SHARED_TABLE_FILE_FACTOR))
+    return run_with_budget(strategies, memory_budget, soft_fraction)
+
+def governed_ocel2_metrics(ocel2_path: str, memory_budget=None, table_dir=None, sqlite_path=None, soft_fraction=DEFAULT_SOFT_FRACTION) -> dict:
+    """
+    params:
+    - ocel2_path: OCEL2 file path (JSON or SQLite)
+    - memory_budget: memory budget in bytes (default: container limit)
+    - table_dir: shared tables of the same log (materialize_ocel2) (default: none)
+    - sqlite_path: OCEL2-SQLite export of the same log, aggregated inside the database (default: none)
+    - soft_fraction: share of the budget at which a strategy falls back to the next cheaper one (default: 0.8)
+    """
+
+    factor = OCEL2_SQLITE_FILE_FACTOR if str(ocel2_path).lower().endswith('.sqlite') else OCEL2_PARSE_FILE_FACTOR
+    strategies = [('parse', lambda: get_ocel2_metrics(ocel2_path), get_path_size(ocel2_path) * factor)]
+    if table_dir is not None and is_shared_table(table_dir):
+        strategies.append(('shared_tables', lambda: get_ocel2_metrics(table_dir), get_path_size(table_dir) * SHARED_TABLE_FILE_FACTOR))
+    if sqlite_path is not None and os.path.isfile(sqlite_path):
+        strategies.append(('sqlite', lambda: get_ocel2_metrics(sqlite_path), get_path_size(sqlite_path) * OCEL2_SQLITE_FILE_FACTOR))
+
+    # cheaper representations of the same log, the most expensive first
+    strategies.sort(key=lambda strategy: strategy[2], reverse=True)
+    return run_with_budget(strategies, memory_budget, soft_fraction)
+
+if __name__ == "__main__":
+    report = governed_ocel2_metrics('data/sample_data/ocel2_sample.json')
+    print_governor_report(report)
@@ -1,13 +1,36 @@
 import pm4py
-import pandas as pd
+from dfg_metrics import compute_dfg
+from temporal_metrics import get_case_durations, describe_distribution
+from ocel2_sqlite_metrics import get_ocel2_sqlite_metrics
+from timestamp_parsing import parse_timestamps, get_time_range_hours
+from shared_tables import is_shared_table, attach_ocel2
+from metadata_reader import get_ocel2_structure
 
-def get_ocel2_metrics(file_path):
+def get_ocel2_metrics(file_path, structure_only=False):
     """
     params:
-    - file_path: OCEL 2 file path
+    - file_path: OCEL 2 file path (JSON or SQLite, or directory of shared tables, see materialize_ocel2)
+    - structure_only: only type and attribute counts of the declared schema, without parsing events and objects (default: False)
     """
 
-    ocel = pm4py.read_ocel2(file_path)
+    # fast path: declared types instead of the observed ones (types without events or objects are counted as well)
+    if structure_only:
+        return get_ocel2_structure(file_path)
+
+    # aggregate directly inside the database instead of loading every table
+    if str(file_path).lower().endswith('.sqlite'):
+        return get_ocel2_sqlite_metrics(file_path)
+
+    # shared tables are attached zero-copy instead of parsing the file again
+    ocel = attach_ocel2(file_path) if is_shared_table(file_path) else pm4py.read_ocel2(file_path)
+    parsed = parse_timestamps(ocel.events[ocel.event_timestamp])
+
+    # identify primary case type by frequency (same choice as the converters)
+    primary_object_type = ocel.relations.groupby(ocel.object_type_column, observed=True).size().idxmax() if len(ocel.relations) > 0 else None
+
+    # lifetimes and inter-event times of the primary type objects (the cases after flattening)
+    primary_relations = ocel.relations[ocel.relations[ocel.object_type_column] == primary_object_type]
+    durations = get_case_durations(primary_relations[ocel.object_id_column], primary_relations[ocel.event_timestamp])
     
     # pm4py allows for simple extraction of statistics
     stats = {
@@ -23,8 +46,14 @@ def get_ocel2_metrics(file_path):
         'avg_events_per_object': len(ocel.relations) / len(ocel.objects) if len(ocel.objects) > 0 else 0,
         'avg_e2o_per_event': len(ocel.relations) / len(ocel.events) if len(ocel.events) > 0 else 0,  
         'avg_o2o_per_object': len(ocel.o2o) / len(ocel.objects) if hasattr(ocel, 'o2o') and len(ocel.objects) > 0 else 0,
-        'time_range_hours': (pd.to_datetime(ocel.events[ocel.event_timestamp]).max() -   
-                           pd.to_datetime(ocel.events[ocel.event_timestamp]).min()).total_seconds() / 3600
+        'time_range_hours': get_time_range_hours(parsed['timestamps']),
+        'num_unparseable_timestamps': parsed['num_unparseable'],
+        'primary_object_type': primary_object_type,
+        'case_duration_distribution': describe_distribution(durations['case_durations_hours']),
+        'inter_event_time_distribution': describe_distribution(durations['inter_event_times_hours']),
+        # directly-follows graph of each object's event sequence
+        'dfg': compute_dfg(ocel.relations[ocel.object_id_column], ocel.relations[ocel.event_activity],
+                           ocel.relations[ocel.event_timestamp], ocel.relations[ocel.object_type_column])
     }  
 
     # print function to be used if ocel2_metrics is used alone (not in a quantifier)
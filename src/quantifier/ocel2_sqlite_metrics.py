@@ -0,0 +1,112 @@
+import sqlite3
+import numpy as np
+import pandas as pd
+from temporal_metrics import describe_distribution
+
+def get_attribute_columns(conn, table: str) -> set:
+    """
+    params:
+    - conn: sqlite connection
+    - table: event or object type table
+    """
+
+    # ocel_id, ocel_time, ocel_changed_field (and the pm4py activity column) are no attributes
+    columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+    return {c for c in columns if not c.startswith('ocel_') and not c.startswith('ocel:')}
+
+def get_ocel2_sqlite_metrics(file_path):
+    """
+    params:
+    - file_path: OCEL 2 SQLite file path
+    """
+
+    conn = sqlite3.connect(file_path)
+
+    existing_tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    event_tables = [f"event_{row[0]}" for row in conn.execute('SELECT ocel_type_map FROM "event_map_type"') if f"event_{row[0]}" in existing_tables]
+    object_tables = [f"object_{row[0]}" for row in conn.execute('SELECT ocel_type_map FROM "object_map_type"') if f"object_{row[0]}" in existing_tables]
+
+    # event timestamps are spread over the event type tables, collect them once (temp table, not loaded into python)
+    conn.execute('CREATE TEMP TABLE "event_time" ("ocel_id" TEXT PRIMARY KEY, "jd" REAL)')
+    num_unparseable_timestamps = 0
+    for table in event_tables:
+        conn.execute(f'INSERT OR IGNORE INTO "event_time" SELECT "ocel_id", julianday("ocel_time") FROM "{table}"')
+        num_unparseable_timestamps += conn.execute(
+            f'SELECT COUNT(*) FROM "{table}" WHERE "ocel_time" IS NOT NULL AND julianday("ocel_time") IS NULL').fetchone()[0]
+
+    num_events, num_event_types = conn.execute('SELECT COUNT(*), COUNT(DISTINCT "ocel_type") FROM "event"').fetchone()
+    num_objects, num_object_types = conn.execute('SELECT COUNT(*), COUNT(DISTINCT "ocel_type") FROM "object"').fetchone()
+    num_e2o = conn.execute('SELECT COUNT(*) FROM "event_object"').fetchone()[0]
+    num_o2o = conn.execute('SELECT COUNT(*) FROM "object_object"').fetchone()[0]
+    time_min, time_max = conn.execute('SELECT MIN("jd"), MAX("jd") FROM "event_time"').fetchone()
+
+    event_attributes = set().union(*[get_attribute_columns(conn, t) for t in event_tables])
+    object_attributes = set().union(*[get_attribute_columns(conn, t) for t in object_tables])
+
+    # rows with a changed field are attribute changes, the others hold the initial values
+    num_dynamic_changes = 0
+    for table in object_tables:
+        columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+        if 'ocel_changed_field' not in columns:
+            continue
+        total, changed, distinct = conn.execute(
+            f'SELECT COUNT(*), COUNT(NULLIF("ocel_changed_field", \'\')), COUNT(DISTINCT "ocel_id") FROM "{table}"').fetchone()
+        num_dynamic_changes += changed if total > changed else total - distinct
+
+    # identify primary case type by frequency (same choice as the converters)
+    row = conn.execute('''
+        SELECT o."ocel_type" FROM "event_object" eo JOIN "object" o ON o."ocel_id" = eo."ocel_object_id"
+        GROUP BY o."ocel_type" ORDER BY COUNT(*) DESC, o."ocel_type" LIMIT 1''').fetchone()
+    primary_object_type = row[0] if row else None
+
+    # lifetimes and inter-event times of the primary type objects (julian days -> milliseconds)
+    case_durations = np.array(conn.execute('''
+        SELECT ROUND((MAX(et."jd") - MIN(et."jd")) * 86400000) FROM "event_object" eo
+        JOIN "object" o ON o."ocel_id" = eo."ocel_object_id"
+        JOIN "event_time" et ON et."ocel_id" = eo."ocel_event_id"
+        WHERE o."ocel_type" = ? GROUP BY eo."ocel_object_id"''', (primary_object_type,)).fetchall(), dtype=float).reshape(-1) / 3.6e6
+    inter_event_times = np.array(conn.execute('''
+        SELECT ROUND(delta * 86400000) FROM (
+            SELECT et."jd" - LAG(et."jd") OVER (PARTITION BY eo."ocel_object_id" ORDER BY et."jd") AS delta
+            FROM "event_object" eo
+            JOIN "object" o ON o."ocel_id" = eo."ocel_object_id"
+            JOIN "event_time" et ON et."ocel_id" = eo."ocel_event_id"
+            WHERE o."ocel_type" = ?)
+        WHERE delta IS NOT NULL''', (primary_object_type,)).fetchall(), dtype=float).reshape(-1) / 3.6e6
+
+    # directly-follows graph of each object's event sequence, aggregated inside the database
+    dfg = pd.DataFrame(conn.execute('''
+        SELECT object_type, source, target, COUNT(*) FROM (
+            SELECT o."ocel_type" AS object_type, e."ocel_type" AS target,
+                   LAG(e."ocel_type") OVER (PARTITION BY eo."ocel_object_id" ORDER BY et."jd") AS source
+            FROM "event_object" eo
+            JOIN "object" o ON o."ocel_id" = eo."ocel_object_id"
+            JOIN "event" e ON e."ocel_id" = eo."ocel_event_id"
+            JOIN "event_time" et ON et."ocel_id" = eo."ocel_event_id")
+        WHERE source IS NOT NULL GROUP BY object_type, source, target''').fetchall(),
+        columns=['object_type', 'source', 'target', 'frequency'])
+
+    conn.close()
+
+    stats = {
+        'num_events': num_events,
+        'num_event_types': num_event_types,
+        'num_event_attributes': len(event_attributes),
+        'num_objects': num_objects,
+        'num_object_types': num_object_types,
+        'num_object_attributes': len(object_attributes),
+        'num_dynamic_changes': num_dynamic_changes,
+        'num_e2o_relationships': num_e2o,
+        'num_o2o_relationships': num_o2o,
+        'avg_events_per_object': num_e2o / num_objects if num_objects > 0 else 0,
+        'avg_e2o_per_event': num_e2o / num_events if num_events > 0 else 0,
+        'avg_o2o_per_object': num_o2o / num_objects if num_objects > 0 else 0,
+        'time_range_hours': round((time_max - time_min) * 86400000) / 3.6e6 if time_min is not None else 0,
+        'num_unparseable_timestamps': num_unparseable_timestamps,
+        'primary_object_type': primary_object_type,
+        'case_duration_distribution': describe_distribution(case_durations),
+        'inter_event_time_distribution': describe_distribution(inter_event_times),
+        'dfg': dfg
+    }
+
+    return stats
@@ -0,0 +1,260 @@
+import numpy as np
+
+# dimensions of each quantifier: sub-scores averaged per dimension, 'loss' dimensions enter the total as 1 - mean,
+# optional sub-scores (from lineage) are averaged only if the metric table provides them
+XES_TO_OCEL2_DIMENSIONS = {
+    'information_preservation': (['event_preservation', 'activity_preservation', 'temporal_consistency',
+                                  'case_duration_similarity', 'inter_event_time_similarity', 'attribute_preservation',
+                                  'dfg_edge_recall', 'dfg_edge_precision', 'dfg_frequency_fidelity'], False, []),
+    'object_enrichment': (['object_discovery_rate', 'e2o_density', 'object_type_diversity',
+                           'o2o_discovery', 'dynamic_utilization'], False, []),
+    'structural_integrity': (['case_coverage', 'distribution_consistency'], False, [])
+}
+
+OCEL2_TO_XES_DIMENSIONS = {
+    'basic_preservation': (['case_selection_preservation', 'activity_type_preservation', 'attribute_mapping_preservation',
+                            'temporal_preservation', 'case_duration_preservation', 'inter_event_time_preservation',
+                            'dfg_edge_recall', 'dfg_edge_precision', 'dfg_frequency_fidelity'], False, []),
+    'information_loss': (['o2o_relationship_loss', 'e2o_relationship_loss', 'multi_object_loss',
+                          'dynamic_attribute_loss', 'object_type_loss'], True, ['event_loss']),
+    'complexity': (['event_distribution_distortion', 'complexity_increase'], True, [])
+}
+
+CSV_ROUNDTRIP_DIMENSIONS = {
+    'preservation': (['case_preservation_ratio', 'event_preservation_ratio', 'activity_preservation_ratio',
+                      'attribute_preservation_ratio', 'avg_events_per_case_preservation', 'multi_attribute_preservation',
+                      'time_range_preservation', 'case_duration_similarity', 'inter_event_time_similarity'], False, []),
+    'structural': (['schema_preservation_ratio', 'dtype_preservation_ratio'], False, []),
+    'quality': (['null_values_analysis', 'unique_values_analysis'], False, [])
+}
+
+# lineage sub-scores a metric table may provide (precomputed 'lineage:<name>', see get_lineage_metrics)
+LINEAGE_SUBSCORES = ['event_preservation', 'event_loss', 'event_duplication']
+
+# default weights (as in the quantifiers)
+XES_TO_OCEL2_WEIGHTS = {'information_preservation': 0.30, 'object_enrichment': 0.40, 'structural_integrity': 0.30}
+OCEL2_TO_XES_WEIGHTS = {'basic_preservation': 0.30, 'information_loss': 0.50, 'complexity': 0.20}
+CSV_ROUNDTRIP_WEIGHTS = {'preservation': 0.6, 'structural': 0.3, 'quality': 0.1}
+
+def build_metric_table(source_metrics: list, target_metrics: list, precomputed=None) -> dict:
+    """
+    params:
+    - source_metrics: metrics dicts of the source files (one per pair)
+    - target_metrics: metrics dicts of the target files (one per pair)
+    - precomputed: sub-scores that are not count based (e.g. distribution and dfg similarities, 'lineage:event_loss'), name -> list
+    """
+
+    # scalar numeric metrics as columns 'source:<name>' and 'target:<name>'
+    table = {}
+    for prefix, metrics in [('source', source_metrics), ('target', target_metrics)]:
+        keys = [k for k, v in metrics[0].items() if isinstance(v, (int, float, np.number)) and not isinstance(v, bool)]
+        for key in keys:
+            table[f"{prefix}:{key}"] = np.array([m[key] for m in metrics], dtype=float)
+    for key, values in (precomputed or {}).items():
+        table[key] = np.asarray(values, dtype=float)
+    return table
+
+def safe_ratio(numerator, denominator):
+    """
+    params:
+    - numerator: array
+    - denominator: array (0 -> result 0, guarded by the callers)
+    """
+
+    numerator, denominator = np.broadcast_arrays(np.asarray(numerator, dtype=float), np.asarray(denominator, dtype=float))
+    return np.divide(numerator, denominator, out=np.zeros(numerator.shape), where=denominator != 0)
+
+def preservation_ratio(source, target, default=0.0):
+    """
+    params:
+    - source: source counts
+    - target: target counts
+    - default: value where the source count is 0 (default: 0.0)
+    """
+
+    # any deviation of 1 (100% preservation) affects the score negatively
+    return np.where(source > 0, 1 - np.abs(1 - safe_ratio(target, source)), default)
+
+def range_consistency(a, b):
+    """
+    params:
+    - a, b: values compared relative to their maximum
+    """
+
+    maximum = np.maximum(a, b)
+    return np.where(maximum > 0, 1 - safe_ratio(np.abs(a - b), maximum), 1.0)
+
+def get_lineage_subscores(table: dict) -> dict:
+    """
+    params:
+    - table: metric table (build_metric_table)
+    """
+
+    return {name: table[f"lineage:{name}"] for name in LINEAGE_SUBSCORES if f"lineage:{name}" in table}
+
+def xes_to_ocel2_subscores(table: dict) -> dict:
+    """
+    params:
+    - table: metric table with source = xes metrics, target = ocel2 metrics (lineage: exact event preservation, loss and duplication)
+    """
+
+    x = lambda k: table[f"source:{k}"]
+    o = lambda k: table[f"target:{k}"]
+
+    xes_attrs = x('num_event_attributes') + x('num_case_attributes')
+    ocel2_attrs = o('num_event_attributes') + o('num_object_attributes')
+    expected_objects = x('num_cases') + x('num_resources')
+    max_attrs = np.maximum(o('num_event_attributes'), o('num_object_attributes'))
+
+    # exact event mapping instead of comparing counts
+    lineage = get_lineage_subscores(table)
+    event_scores = {'event_preservation': preservation_ratio(x('num_events'), o('num_events'))}
+    event_scores.update(lineage)
+
+    return {
+        **event_scores,
+        'activity_preservation': preservation_ratio(x('num_activities'), o('num_event_types')),
+        'temporal_consistency': range_consistency(x('time_range_hours'), o('time_range_hours')),
+        'case_duration_similarity': table['case_duration_similarity'],
+        'inter_event_time_similarity': table['inter_event_time_similarity'],
+        'attribute_preservation': np.where(xes_attrs > 0, 1 - np.abs(safe_ratio(ocel2_attrs, xes_attrs)), 1.0),
+        'dfg_edge_recall': table['dfg_edge_recall'],
+        'dfg_edge_precision': table['dfg_edge_precision'],
+        'dfg_frequency_fidelity': table['dfg_frequency_fidelity'],
+        'object_discovery_rate': np.where(expected_objects > 0, np.minimum(safe_ratio(o('num_objects'), expected_objects), 1.0), 0.0),
+        'e2o_density': np.minimum(o('avg_e2o_per_event') / 2.0, 1.0),
+        'object_type_diversity': np.minimum(o('num_object_types') / 2, 1.0),
+        'o2o_discovery': np.where(o('num_objects') > 0, np.minimum(safe_ratio(o('num_o2o_relationships'), o('num_objects')), 1), 0.0),
+        'dynamic_utilization': np.where(max_attrs > 0, np.minimum(safe_ratio(o('num_dynamic_changes'), ocel2_attrs), 0.1) * 10, 1.0),
+        'case_coverage': preservation_ratio(x('num_cases'), o('num_objects') - x('num_resources')),
+        'distribution_consistency': range_consistency(x('avg_events_per_case'), o('avg_events_per_object'))
+    }
+
+def ocel2_to_xes_subscores(table: dict) -> dict:
+    """
+    params:
+    - table: metric table with source = ocel2 metrics, target = xes metrics (lineage: exact event loss and duplication)
+    """
+
+    o = lambda k: table[f"source:{k}"]
+    x = lambda k: table[f"target:{k}"]
+
+    ocel2_attrs = o('num_event_attributes') + o('num_object_attributes')
+    xes_attrs = x('num_event_attributes') + x('num_case_attributes')
+    e2o_loss = np.where(o('avg_e2o_per_event') > 0, np.maximum(0, 1 - safe_ratio(1, o('avg_e2o_per_event'))), 0.0)
+
+    # events without an object of the case notion are dropped by the flattening (only visible with lineage)
+    lineage = get_lineage_subscores(table)
+    event_loss = {'event_loss': lineage['event_loss']} if 'event_loss' in lineage else {}
+
+    return {
+        'case_selection_preservation': np.where(o('num_objects') > 0, np.minimum(safe_ratio(x('num_cases'), o('num_objects')), 1.0), 1.0),
+        'activity_type_preservation': np.where(o('num_event_types') > 0, np.minimum(safe_ratio(x('num_activities'), o('num_event_types')), 1.0), 1.0),
+        'attribute_mapping_preservation': np.where(ocel2_attrs > 0, np.abs(safe_ratio(xes_attrs, ocel2_attrs)) - 1, 1.0),
+        'temporal_preservation': range_consistency(x('time_range_hours'), o('time_range_hours')),
+        'case_duration_preservation': table['case_duration_preservation'],
+        'inter_event_time_preservation': table['inter_event_time_preservation'],
+        'dfg_edge_recall': table['dfg_edge_recall'],
+        'dfg_edge_precision': table['dfg_edge_precision'],
+        'dfg_frequency_fidelity': table['dfg_frequency_fidelity'],
+        'o2o_relationship_loss': np.where(o('num_objects') > 0, o('num_o2o_relationships'), 0.0),
+        'e2o_relationship_loss': e2o_loss,
+        'multi_object_loss': e2o_loss,
+        'dynamic_attribute_loss': np.where(o('num_dynamic_changes') > 0, 1.0, 0.0),
+        'object_type_loss': np.where(o('num_object_types') > 0, 1 - safe_ratio(1, o('num_object_types')), 0.0),
+        **event_loss,
+        'event_distribution_distortion': np.where(o('avg_events_per_object') > 0,
+                                                  safe_ratio(np.abs(x('avg_events_per_case') - o('avg_events_per_object')), o('avg_events_per_object')), 0.0),
+        # exact share of duplicated events with lineage (lost and duplicated events no longer cancel out)
+        'complexity_increase': lineage['event_duplication'] if 'event_duplication' in lineage else
+                               np.where(o('num_events') > 0, safe_ratio(np.abs(x('num_events') - o('num_events')), o('num_events')), 0.0)
+    }
+
+def csv_roundtrip_subscores(table: dict) -> dict:
+    """
+    params:
+    - table: metric table with source = original csv stats, target = roundtrip csv stats (lineage: exact event preservation)
+    """
+
+    s = lambda k: table[f"source:{k}"]
+    t = lambda k: table[f"target:{k}"]
+    lineage = get_lineage_subscores(table)
+
+    return {
+        'case_preservation_ratio': preservation_ratio(s('num_cases'), t('num_cases')),
+        'event_preservation_ratio': lineage['event_preservation'] if 'event_preservation' in lineage else preservation_ratio(s('num_events'), t('num_events')),
+        'activity_preservation_ratio': preservation_ratio(s('num_activities'), t('num_activities')),
+        'attribute_preservation_ratio': preservation_ratio(s('num_event_attributes'), t('num_event_attributes')),
+        'avg_events_per_case_preservation': preservation_ratio(s('avg_events_per_case'), t('avg_events_per_case')),
+        'multi_attribute_preservation': preservation_ratio(s('num_multi_attributes'), t('num_multi_attributes'), 1.0),
+        'time_range_preservation': preservation_ratio(s('time_range_hours'), t('time_range_hours'), 1.0),
+        'case_duration_similarity': table['case_duration_similarity'],
+        'inter_event_time_similarity': table['inter_event_time_similarity'],
+        'schema_preservation_ratio': table['schema_preservation_ratio'],
+        'dtype_preservation_ratio': table['dtype_preservation_ratio'],
+        'null_values_analysis': table['null_values_analysis'],
+        'unique_values_analysis': table['unique_values_analysis']
+    }
+
+def compute_dimension_scores(subscores: dict, dimensions: dict) -> dict:
+    """
+    params:
+    - subscores: sub-score arrays (e.g. xes_to_ocel2_subscores, entries may be overridden or appended before)
+    - dimensions: dimension spec (e.g. XES_TO_OCEL2_DIMENSIONS), dimension -> (sub-score names, is loss, optional sub-score names)
+    """
+
+    scores = {}
+    for dimension, (keys, is_loss, optional_keys) in dimensions.items():
+        keys = keys + [k for k in optional_keys if k in subscores]
+        mean = np.mean(np.stack([subscores[k] for k in keys]), axis=0)
+        scores[dimension] = 1 - mean if is_loss else mean
+    return scores
+
+def compute_weighted_totals(dimension_scores: dict, weights) -> np.ndarray:
+    """
+    params:
+    - dimension_scores: dimension score arrays (compute_dimension_scores)
+    - weights: weights dict (dimension -> weight) or list of such dicts for a sweep
+    """
+
+    # (num weightings x num dimensions) @ (num dimensions x num pairs)
+    dimensions = list(dimension_scores)
+    scores = np.stack([dimension_scores[d] for d in dimensions])
+    weight_matrix = np.array([[w[d] for d in dimensions] for w in ([weights] if isinstance(weights, dict) else weights)])
+    totals = weight_matrix @ scores
+    return totals[0] if isinstance(weights, dict) else totals
+
+def score_pairs(subscore_function, dimensions: dict, table: dict, weights) -> dict:
+    """
+    params:
+    - subscore_function: xes_to_ocel2_subscores, ocel2_to_xes_subscores or csv_roundtrip_subscores
+    - dimensions: matching dimension spec
+    - table: metric table (build_metric_table)
+    - weights: weights dict or list of weights dicts
+    """
+
+    subscores = subscore_function(table)
+    dimension_scores = compute_dimension_scores(subscores, dimensions)
+    return {
+        'subscores': subscores,
+        'dimension_scores': dimension_scores,
+        'total_scores': compute_weighted_totals(dimension_scores, weights)
+    }
+
+def score_pair(subscore_function, dimensions: dict, source_metrics: dict, target_metrics: dict, precomputed: dict, weights: dict) -> dict:
+    """
+    params:
+    - subscore_function, dimensions, weights: see score_pairs
+    - source_metrics: metrics dict of the source file
+    - target_metrics: metrics dict of the target file
+    - precomputed: sub-scores that are not count based, name -> value
+    """
+
+    # one-row metric table, so that a single comparison uses the same formulas as a sweep
+    table = build_metric_table([source_metrics], [target_metrics], {k: [v] for k, v in precomputed.items()})
+    scores = score_pairs(subscore_function, dimensions, table, weights)
+    return {
+        'subscores': {k: float(v[0]) for k, v in scores['subscores'].items()},
+        'dimension_scores': {k: float(v[0]) for k, v in scores['dimension_scores'].items()},
+        'total_score': float(scores['total_scores'][0])
+    }
@@ -0,0 +1,159 @@
+import os
+import sys
+import json
+import pickle
+import numpy as np
+import pandas as pd
+import pm4py
+from pm4py.objects.ocel.obj import OCEL
+
+# list attribute handling is shared with the converters (list_attributes)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'converter'))
+from list_attributes import flatten_list_attributes
+
+# metadata file marking a directory of shared tables
+TABLE_METADATA_FILE = 'tables.json'
+
+# tables of an OCEL2 log (pm4py attribute names)
+OCEL2_TABLES = ['events', 'objects', 'relations', 'o2o', 'object_changes']
+
+def is_shared_table(path: str) -> bool:
+    """
+    params:
+    - path: file or directory path
+    """
+
+    return os.path.isfile(os.path.join(str(path), TABLE_METADATA_FILE))
+
+def get_code_dtype(num_categories: int):
+    """
+    params:
+    - num_categories: number of distinct values (code -1 = missing)
+    """
+
+    for dtype in [np.int8, np.int16, np.int32]:
+        if num_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+def materialize_frame(df: pd.DataFrame, frame_dir: str) -> list:
+    """
+    params:
+    - df: data frame to materialize
+    - frame_dir: directory for the column files
+    """
+
+    # one .npy file per column, strings and objects as categorical codes (categories pickled)
+    os.makedirs(frame_dir, exist_ok=True)
+    columns = []
+    for i, col in enumerate(df.columns):
+        values = df[col]
+        column = {'name': col, 'file': f"{i}.npy"}
+        if isinstance(values.dtype, pd.DatetimeTZDtype) or pd.api.types.is_datetime64_dtype(values):
+            timestamps = values.dt.tz_convert('UTC').dt.tz_localize(None) if isinstance(values.dtype, pd.DatetimeTZDtype) else values
+            np.save(os.path.join(frame_dir, column['file']), timestamps.to_numpy(dtype='datetime64[ns]').view(np.int64))
+            column['kind'] = 'datetime'
+            column['tz'] = str(values.dt.tz) if values.dt.tz is not None else None
+        elif pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+            np.save(os.path.join(frame_dir, column['file']), values.to_numpy())
+            column['kind'] = 'numeric'
+        else:
+            # sorted categories keep the group order of the original column
+            try:
+                codes, categories = pd.factorize(values, sort=True)
+            except TypeError:
+                codes, categories = pd.factorize(values)
+            np.save(os.path.join(frame_dir, column['file']), codes.astype(get_code_dtype(len(categories))))
+            column['kind'] = 'categorical'
+            column['categories_file'] = f"{i}.categories.pkl"
+            with open(os.path.join(frame_dir, column['categories_file']), 'wb') as f:
+                pickle.dump(list(categories), f, protocol=pickle.HIGHEST_PROTOCOL)
+        columns.append(column)
+    return columns
+
+def attach_frame(frame_dir: str, columns: list) -> pd.DataFrame:
+    """
+    params:
+    - frame_dir: directory of the column files
+    - columns: column specs (materialize_frame)
+    """
+
+    # columns are read-only views on the memory-mapped files, datetimes stay naive utc (localizing would copy)
+    series = {}
+    for column in columns:
+        values = np.load(os.path.join(frame_dir, column['file']), mmap_mode='r')
+        if column['kind'] == 'datetime':
+            series[column['name']] = pd.Series(values.view('datetime64[ns]'), copy=False)
+        elif column['kind'] == 'categorical':
+            with open(os.path.join(frame_dir, column['categories_file']), 'rb') as f:
+                categories = pickle.load(f)
+            series[column['name']] = pd.Series(pd.Categorical.from_codes(values, categories=pd.Index(categories, dtype=object)), copy=False)
+        else:
+            series[column['name']] = pd.Series(values, copy=False)
+    return pd.DataFrame(series, copy=False)
+
+def write_table_metadata(table_dir: str, metadata: dict):
+    """
+    params:
+    - table_dir: directory of the shared tables
+    - metadata: source path, format and column specs per table
+    """
+
+    # written last, a directory without metadata is not attached
+    with open(os.path.join(table_dir, TABLE_METADATA_FILE), 'w') as f:
+        json.dump(metadata, f, indent=2)
+
+def read_table_metadata(table_dir: str) -> dict:
+    """
+    params:
+    - table_dir: directory of the shared tables
+    """
+
+    with open(os.path.join(table_dir, TABLE_METADATA_FILE)) as f:
+        return json.load(f)
+
+def materialize_ocel2(ocel2_path: str, table_dir: str) -> str:
+    """
+    params:
+    - ocel2_path: OCEL2 file path (parsed once)
+    - table_dir: output directory of the shared tables
+    """
+
+    ocel = pm4py.read_ocel2(ocel2_path)
+    tables = {name: materialize_frame(getattr(ocel, name), os.path.join(table_dir, name)) for name in OCEL2_TABLES}
+    write_table_metadata(table_dir, {'source': os.path.abspath(ocel2_path), 'format': 'ocel2', 'tables': tables})
+    return table_dir
+
+def materialize_xes(xes_path: str, table_dir: str) -> str:
+    """
+    params:
+    - xes_path: XES file path (parsed once)
+    - table_dir: output directory of the shared tables
+    """
+
+    df = flatten_list_attributes(pm4py.convert_to_dataframe(pm4py.read_xes(xes_path)).reset_index(drop=True))
+    tables = {'events': materialize_frame(df, os.path.join(table_dir, 'events'))}
+    write_table_metadata(table_dir, {'source': os.path.abspath(xes_path), 'format': 'xes', 'tables': tables})
+    return table_dir
+
+def attach_ocel2(table_dir: str) -> OCEL:
+    """
+    params:
+    - table_dir: directory written by materialize_ocel2
+    """
+
+    metadata = read_table_metadata(table_dir)
+    if metadata['format'] != 'ocel2':
+        raise ValueError(f"{table_dir} enthält keine OCEL2-Tabellen.")
+    return OCEL(**{name: attach_frame(os.path.join(table_dir, name), metadata['tables'][name]) for name in OCEL2_TABLES})
+
+def attach_xes(table_dir: str) -> pd.DataFrame:
+    """
+    params:
+    - table_dir: directory written by materialize_xes
+    """
+
+    metadata = read_table_metadata(table_dir)
+    if metadata['format'] != 'xes':
+        raise ValueError(f"{table_dir} enthält keine XES-Tabellen.")
+    return attach_frame(os.path.join(table_dir, 'events'), metadata['tables']['events'])
@@ -0,0 +1,377 @@
+import os
+import sys
+import csv
+import itertools
+import queue
+import time
+from collections import Counter, deque
+from datetime import datetime
+
+# the multi-value delimiter is shared with the converters (list_attributes, as in csv_to_xes)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'converter'))
+from list_attributes import MULTI_VALUE_DELIMITER
+
+# delimiters counted as potential multi-value fields (as in get_csv_metrics)
+MULTI_VALUE_DELIMITERS = [';', '|', ',', '&', '+']
+
+def follow_lines(f, poll_interval=1.0, idle_timeout=None):
+    """
+    params:
+    - f: text file opened with newline=''
+    - poll_interval, idle_timeout: see read_csv_stream
+    """
+
+    idle_since = time.monotonic()
+    following = True
+    while True:
+        position = f.tell()
+        line = f.readline()
+
+        # incomplete last line: the writer has not finished it yet (unless the stream went idle)
+        if not line.endswith('\n') and following:
+            if idle_timeout is None or time.monotonic() - idle_since <= idle_timeout:
+                f.seek(position)
+                time.sleep(poll_interval)
+                continue
+            following = False
+        if not line:
+            return
+
+        idle_since = time.monotonic()
+        yield line
+
+def read_csv_stream(csv_path: str, follow=False, poll_interval=1.0, idle_timeout=None):
+    """
+    params:
+    - csv_path: CSV file path
+    - follow: keep waiting for rows appended to the file (default: False)
+    - poll_interval: seconds between checks for new rows when following (default: 1.0)
+    - idle_timeout: stop following after this many seconds without new rows (default: never)
+    """
+
+    with open(csv_path, newline='') as f:
+        # the csv reader joins quoted fields spanning several lines, following only hands it complete lines
+        rows = csv.reader(follow_lines(f, poll_interval, idle_timeout) if follow else f)
+        header = next(rows)
+        for values in rows:
+            if any(v.strip() for v in values):
+                yield {k: (v if v != '' else None) for k, v in zip(header, values)}
+
+def read_queue_stream(event_queue: queue.Queue, sentinel=None, timeout=None):
+    """
+    params:
+    - event_queue: queue of row dicts (stand-in for a message queue)
+    - sentinel: item marking the end of the stream (default: None)
+    - timeout: stop after this many seconds without an item (default: never)
+    """
+
+    while True:
+        try:
+            item = event_queue.get(timeout=timeout)
+        except queue.Empty:
+            return
+        if item is sentinel:
+            return
+        yield item
+
+def map_csv_event(row: dict,
+                  case_col='case_id',
+                  activity_col='activity',
+                  timestamp_col='timestamp',
+                  resource_col='resource',
+                  timestamp_format='%Y-%m-%d %H:%M:%S') -> list:
+    """
+    params:
+    - row: csv row (column -> value)
+    - case_col, activity_col, timestamp_col, resource_col, timestamp_format: see csv_to_xes
+    """
+
+    # declare empty case_ids to SYSTEM
+    case_id = str(row.get(case_col) or '').strip() or 'SYSTEM'
+
+    try:
+        timestamp = datetime.strptime(str(row.get(timestamp_col)), timestamp_format)
+    except ValueError:
+        timestamp = None
+
+    # one xes event per combination of multi-values (last column varies fastest)
+    attr_cols = [c for c in row if c not in [case_col, activity_col, timestamp_col]]
+    split_values = [
+        [v.strip() for v in row[c].split(MULTI_VALUE_DELIMITER)] if isinstance(row[c], str) else [row[c]]
+        for c in attr_cols
+    ]
+
+    events = []
+    for values in itertools.product(*split_values):
+        attributes = dict(zip(attr_cols, values))
+        events.append({
+            'case:concept:name': case_id,
+            'concept:name': row.get(activity_col),
+            'time:timestamp': timestamp,
+            'org:resource': attributes.pop(resource_col, None),
+            'attributes': attributes
+        })
+    return events
+
+def init_stream_state(window_size=None):
+    """
+    params:
+    - window_size: number of source rows in the window (default: no window, all rows)
+    """
+
+    return {
+        'window_size': window_size,
+        'window': deque(),  # (seq, timestamp, csv row, xes events) of the rows in the window
+        'seq': 0,
+        'csv': {'num_events': 0, 'cases': Counter(), 'activities': Counter(), 'multi_attributes': Counter()},
+        'xes': {'num_events': 0, 'cases': Counter(), 'activities': Counter(), 'resources': Counter()},
+        'ocel2': {'num_events': 0, 'event_types': Counter(), 'objects': Counter(), 'object_types': Counter(), 'num_e2o': 0},
+        # monotonic deques of (seq, timestamp) for the window minimum and maximum
+        'time_min': deque(),
+        'time_max': deque(),
+        # first and last timestamp per case (only without window)
+        'case_bounds': {},
+        'case_duration_sum': 0.0
+    }
+
+def add_count(counter: Counter, key, delta: int) -> int:
+    """
+    params:
+    - counter: counter
+    - key: counted key
+    - delta: +1 or -1
+    """
+
+    # remove keys reaching zero so that len(counter) stays the number of distinct keys
+    counter[key] += delta
+    count = counter[key]
+    if count == 0:
+        del counter[key]
+    return count
+
+def apply_row(state: dict, row: dict, events: list, timestamp, delta: int):
+    """
+    params:
+    - state: stream state
+    - row: attribute columns of the csv row
+    - events: xes events mapped from the row
+    - timestamp: parsed timestamp of the row
+    - delta: +1 to add the row, -1 to remove it from the window
+    """
+
+    case_id = events[0]['case:concept:name']
+
+    csv_view = state['csv']
+    csv_view['num_events'] += delta
+    add_count(csv_view['cases'], case_id, delta)
+    add_count(csv_view['activities'], events[0]['concept:name'], delta)
+    for col, val in row.items():
+        if isinstance(val, str) and any(d in val for d in MULTI_VALUE_DELIMITERS):
+            add_count(csv_view['multi_attributes'], col, delta)
+
+    xes_view = state['xes']
+    ocel2_view = state['ocel2']
+    for event in events:
+        xes_view['num_events'] += delta
+        add_count(xes_view['cases'], event['case:concept:name'], delta)
+        add_count(xes_view['activities'], event['concept:name'], delta)
+
+        # xes_to_ocel2 mapping: case object plus resource object (if present)
+        objects = [('case', f"case_{event['case:concept:name']}")]
+        if event['org:resource'] is not None:
+            add_count(xes_view['resources'], event['org:resource'], delta)
+            objects.append(('resource', f"resource_{event['org:resource']}"))
+
+        ocel2_view['num_events'] += delta
+        add_count(ocel2_view['event_types'], event['concept:name'], delta)
+        for object_type, object_id in objects:
+            ocel2_view['num_e2o'] += delta
+            count = add_count(ocel2_view['objects'], object_id, delta)
+            # object appears (0 -> 1) or disappears (1 -> 0)
+            if (delta > 0 and count == 1) or (delta < 0 and count == 0):
+                add_count(ocel2_view['object_types'], object_type, delta)
+
+    # case durations are only tracked over the whole stream (removing bounds would need all timestamps)
+    if state['window_size'] is None and timestamp is not None:
+        bounds = state['case_bounds'].get(case_id)
+        if bounds is None:
+            state['case_bounds'][case_id] = [timestamp, timestamp]
+        else:
+            old_duration = (bounds[1] - bounds[0]).total_seconds()
+            bounds[0], bounds[1] = min(bounds[0], timestamp), max(bounds[1], timestamp)
+            state['case_duration_sum'] += (bounds[1] - bounds[0]).total_seconds() - old_duration
+
+def update_stream_state(state: dict, row: dict, events: list):
+    """
+    params:
+    - state: stream state
+    - row: attribute columns of the csv row
+    - events: xes events mapped from the row
+    """
+
+    seq = state['seq']
+    state['seq'] += 1
+    timestamp = events[0]['time:timestamp']
+
+    apply_row(state, row, events, timestamp, +1)
+    if timestamp is not None:
+        while state['time_min'] and state['time_min'][-1][1] >= timestamp:
+            state['time_min'].pop()
+        state['time_min'].append((seq, timestamp))
+        while state['time_max'] and state['time_max'][-1][1] <= timestamp:
+            state['time_max'].pop()
+        state['time_max'].append((seq, timestamp))
+
+    # evict the oldest row once the window is full (each row is added and removed once)
+    if state['window_size'] is not None:
+        state['window'].append((seq, timestamp, row, events))
+        if len(state['window']) > state['window_size']:
+            old_seq, old_timestamp, old_row, old_events = state['window'].popleft()
+            apply_row(state, old_row, old_events, old_timestamp, -1)
+            for tracker in (state['time_min'], state['time_max']):
+                if tracker and tracker[0][0] == old_seq:
+                    tracker.popleft()
+
+def get_stream_metrics(state: dict) -> dict:
+    """
+    params:
+    - state: stream state
+    """
+
+    time_range_hours = (state['time_max'][0][1] - state['time_min'][0][1]).total_seconds() / 3600 if state['time_min'] else 0
+
+    csv_view, xes_view, ocel2_view = state['csv'], state['xes'], state['ocel2']
+    num_csv_cases = len(csv_view['cases'])
+    num_xes_cases = len(xes_view['cases'])
+    num_objects = len(ocel2_view['objects'])
+
+    metrics = {
+        'csv': {
+            'num_events': csv_view['num_events'],
+            'num_cases': num_csv_cases,
+            'num_activities': len(csv_view['activities']),
+            'num_multi_attributes': len(csv_view['multi_attributes']),
+            'avg_events_per_case': csv_view['num_events'] / num_csv_cases if num_csv_cases > 0 else 0,
+            'time_range_hours': time_range_hours
+        },
+        'xes': {
+            'num_events': xes_view['num_events'],
+            'num_cases': num_xes_cases,
+            'num_activities': len(xes_view['activities']),
+            'num_resources': len(xes_view['resources']),
+            'avg_events_per_case': xes_view['num_events'] / num_xes_cases if num_xes_cases > 0 else 0,
+            'time_range_hours': time_range_hours
+        },
+        'ocel2': {
+            'num_events': ocel2_view['num_events'],
+            'num_event_types': len(ocel2_view['event_types']),
+            'num_objects': num_objects,
+            'num_object_types': len(ocel2_view['object_types']),
+            'num_e2o_relationships': ocel2_view['num_e2o'],
+            'avg_events_per_object': ocel2_view['num_e2o'] / num_objects if num_objects > 0 else 0,
+            'avg_e2o_per_event': ocel2_view['num_e2o'] / ocel2_view['num_events'] if ocel2_view['num_events'] > 0 else 0,
+            'time_range_hours': time_range_hours
+        }
+    }
+
+    if state['window_size'] is None:
+        num_cases = len(state['case_bounds'])
+        avg_case_duration_hours = state['case_duration_sum'] / num_cases / 3600 if num_cases > 0 else 0
+        metrics['csv']['avg_case_duration_hours'] = avg_case_duration_hours
+        metrics['xes']['avg_case_duration_hours'] = avg_case_duration_hours
+
+    return metrics
+
+def ratio_preservation(source, target) -> float:
+    """
+    params:
+    - source: source count
+    - target: target count
+    """
+
+    # any deviation of 1 (100% preservation) affects the score negatively
+    return float(1 - abs(1 - target / source)) if source > 0 else 0.0
+
+def get_stream_scores(metrics: dict) -> dict:
+    """
+    params:
+    - metrics: stream metrics (get_stream_metrics)
+    """
+
+    # count based scores of csv_roundtrip_quantifier and xes_to_ocel2_quantifier on the streamed views
+    csv_m, xes_m, ocel2_m = metrics['csv'], metrics['xes'], metrics['ocel2']
+    expected_objects = xes_m['num_cases'] + xes_m['num_resources']
+    avg_events = max(xes_m['avg_events_per_case'], ocel2_m['avg_events_per_object'])
+
+    scores = {
+        'csv_to_xes_event_preservation': ratio_preservation(csv_m['num_events'], xes_m['num_events']),
+        'csv_to_xes_case_preservation': ratio_preservation(csv_m['num_cases'], xes_m['num_cases']),
+        'csv_to_xes_activity_preservation': ratio_preservation(csv_m['num_activities'], xes_m['num_activities']),
+        'xes_to_ocel2_event_preservation': ratio_preservation(xes_m['num_events'], ocel2_m['num_events']),
+        'xes_to_ocel2_activity_preservation': ratio_preservation(xes_m['num_activities'], ocel2_m['num_event_types']),
+        'object_discovery_rate': min(ocel2_m['num_objects'] / expected_objects, 1.0) if expected_objects > 0 else 0.0,
+        'e2o_density': min(ocel2_m['avg_e2o_per_event'] / 2.0, 1.0),
+        'object_type_diversity': min(ocel2_m['num_object_types'] / 2, 1.0),
+        'case_coverage': ratio_preservation(xes_m['num_cases'], ocel2_m['num_objects'] - xes_m['num_resources']),
+        'distribution_consistency': 1 - abs(xes_m['avg_events_per_case'] - ocel2_m['avg_events_per_object']) / avg_events if avg_events > 0 else 1.0
+    }
+    scores['stream_score'] = sum(scores.values()) / len(scores)
+    return scores
+
+def stream_quantifier(rows,
+                      emit_interval=100,
+                      window_size=None,
+                      window_type='sliding',
+                      case_col='case_id',
+                      activity_col='activity',
+                      timestamp_col='timestamp',
+                      resource_col='resource',
+                      timestamp_format='%Y-%m-%d %H:%M:%S'):
+    """
+    params:
+    - rows: iterable of csv rows (list, read_csv_stream or read_queue_stream)
+    - emit_interval: number of rows between two emitted results (default: 100)
+    - window_size: number of rows the metrics are computed over (default: all rows so far)
+    - window_type: 'sliding' (last window_size rows) or 'tumbling' (restart every window_size rows) (default: 'sliding')
+    - case_col, activity_col, timestamp_col, resource_col, timestamp_format: see csv_to_xes
+    """
+
+    if window_type not in ['sliding', 'tumbling']:
+        raise ValueError(f"Unbekannter window_type: {window_type}")
+
+    # tumbling windows restart with an empty state, so no rows have to be evicted
+    state = init_stream_state(window_size if window_type == 'sliding' else None)
+    num_rows = 0
+
+    for row in rows:
+        events = map_csv_event(row, case_col, activity_col, timestamp_col, resource_col, timestamp_format)
+        attributes = {c: v for c, v in row.items() if c not in [case_col, activity_col, timestamp_col]}
+        update_stream_state(state, attributes, events)
+        num_rows += 1
+
+        window_end = window_type == 'tumbling' and window_size is not None and num_rows % window_size == 0
+        if num_rows % emit_interval == 0 or window_end:
+            metrics = get_stream_metrics(state)
+            yield {'num_rows': num_rows, 'metrics': metrics, 'scores': get_stream_scores(metrics)}
+        if window_end:
+            state = init_stream_state()
+
+    # final result for the remaining rows
+    if state['seq'] > 0 and num_rows % emit_interval != 0:
+        metrics = get_stream_metrics(state)
+        yield {'num_rows': num_rows, 'metrics': metrics, 'scores': get_stream_scores(metrics)}
+
+def print_stream_scores(result: dict):
+    """
+    params:
+    - result: result emitted by stream_quantifier
+    """
+
+    metrics = result['metrics']
+    print(f"Zeilen: {result['num_rows']} | Events CSV/XES/OCEL2: "
+          f"{metrics['csv']['num_events']}/{metrics['xes']['num_events']}/{metrics['ocel2']['num_events']} | "
+          f"Objekte: {metrics['ocel2']['num_objects']} | Stream-Score: {result['scores']['stream_score']:.3f}")
+
+if __name__ == "__main__":
+    for result in stream_quantifier(read_csv_stream('data/sample_data/csv_sample_multi.csv'), emit_interval=5):
+        print_stream_scores(result)
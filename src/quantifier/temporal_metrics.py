@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+from typing import Dict
+
+# quantile grid used to describe and compare distributions
+QUANTILE_LEVELS = np.linspace(0, 1, 101)
+NUM_HISTOGRAM_BINS = 20
+
+def get_case_durations(case_ids, timestamps) -> Dict[str, np.ndarray]:
+    """
+    params:
+    - case_ids: case id (or object id) of each event
+    - timestamps: timestamp of each event
+    """
+
+    events = pd.DataFrame({
+        'case': np.asarray(case_ids, dtype=object),
+        'time': pd.DatetimeIndex(pd.to_datetime(pd.Series(timestamps), utc=True)).asi8
+    })
+    events = events[events['time'] != np.iinfo(np.int64).min]  # drop NaT
+
+    # per-case first/last timestamp and number of events
+    per_case = events.groupby('case', sort=False)['time'].agg(['min', 'max', 'count'])
+    case_durations = (per_case['max'] - per_case['min']).to_numpy() / 3.6e12
+
+    # time between directly following events of the same case
+    case_codes = pd.factorize(events['case'])[0]
+    time_values = events['time'].to_numpy()
+    same_case = case_codes[1:] == case_codes[:-1]
+    if not np.all((case_codes[1:] > case_codes[:-1]) | (same_case & (time_values[1:] >= time_values[:-1]))):
+        order = np.lexsort((time_values, case_codes))
+        case_codes, time_values = case_codes[order], time_values[order]
+        same_case = case_codes[1:] == case_codes[:-1]
+    inter_event_times = (time_values[1:] - time_values[:-1])[same_case] / 3.6e12
+
+    return {
+        'case_durations_hours': case_durations,
+        'inter_event_times_hours': inter_event_times,
+        'events_per_case': per_case['count'].to_numpy()
+    }
+
+def describe_distribution(values: np.ndarray) -> Dict:
+    """
+    params:
+    - values: sample of the distribution (e.g. case durations in hours)
+    """
+
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        return {'count': 0, 'mean': 0.0, 'quantiles': np.zeros(len(QUANTILE_LEVELS)),
+                'histogram': {'bin_edges': np.zeros(NUM_HISTOGRAM_BINS + 1), 'counts': np.zeros(NUM_HISTOGRAM_BINS, dtype=np.int64)}}
+
+    counts, bin_edges = np.histogram(values, bins=NUM_HISTOGRAM_BINS)
+    return {
+        'count': len(values),
+        'mean': float(values.mean()),
+        'quantiles': np.quantile(values, QUANTILE_LEVELS),
+        'histogram': {'bin_edges': bin_edges, 'counts': counts}
+    }
+
+def distribution_similarity(source: Dict, target: Dict) -> float:
+    """
+    params:
+    - source: distribution description before the transformation (see describe_distribution)
+    - target: distribution description after the transformation
+    """
+
+    if source['count'] == 0 or target['count'] == 0:
+        return 1.0 if source['count'] == target['count'] else 0.0
+
+    # wasserstein-1 distance approximated on the quantile grid, normalized by the largest value
+    distance = np.mean(np.abs(source['quantiles'] - target['quantiles']))
+    scale = max(abs(source['quantiles'][-1]), abs(target['quantiles'][-1]))
+    return float(1 - min(distance / scale, 1.0)) if scale > 0 else 1.0
@@ -0,0 +1,101 @@
+import os
+import pandas as pd
+
+# number of non-null values used for format detection
+DEFAULT_SAMPLE_SIZE = 1000
+
+# candidate formats in order of preference ('ISO8601' is the pandas fast path for any iso variant)
+CANDIDATE_FORMATS = [
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M:%S%z',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S%z',
+    '%Y-%m-%d %H:%M:%S.%f',
+    '%Y-%m-%dT%H:%M:%S.%f',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%d',
+    '%d.%m.%Y %H:%M:%S',
+    '%d.%m.%Y %H:%M',
+    '%d.%m.%Y',
+    '%d/%m/%Y %H:%M:%S',
+    '%m/%d/%Y %H:%M:%S',
+    'ISO8601'
+]
+
+# detected format per (file, modification time, size, column)
+FORMAT_CACHE = {}
+
+def get_format_cache_key(file_path: str, column: str):
+    """
+    params:
+    - file_path: file containing the timestamps
+    - column: timestamp column
+    """
+
+    # a rewritten file gets a new key, so its format is detected again
+    stat = os.stat(file_path)
+    return (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, column)
+
+def detect_timestamp_format(values: pd.Series, sample_size=DEFAULT_SAMPLE_SIZE):
+    """
+    params:
+    - values: timestamp strings
+    - sample_size: number of non-null values used for detection (default: 1000)
+    """
+
+    sample = values.dropna().astype(str).head(sample_size)
+    if sample.empty:
+        return None
+
+    # first format that parses the whole sample, otherwise the one parsing most of it
+    best_format, best_count = None, 0
+    for fmt in CANDIDATE_FORMATS:
+        count = pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum()
+        if count == len(sample):
+            return fmt
+        if count > best_count:
+            best_format, best_count = fmt, count
+
+    # no fixed format fits: per-element inference
+    return best_format if best_count > 0 else 'mixed'
+
+def parse_timestamps(values: pd.Series, timestamp_format=None, cache_key=None, sample_size=DEFAULT_SAMPLE_SIZE) -> dict:
+    """
+    params:
+    - values: timestamp column (strings or already parsed)
+    - timestamp_format: fixed format (default: detected from a sample)
+    - cache_key: key of the detected format (get_format_cache_key, default: no caching)
+    - sample_size: number of non-null values used for detection (default: 1000)
+    """
+
+    # already parsed columns (e.g. from pm4py) are used as they are
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return {'timestamps': values, 'format': None, 'num_unparseable': 0}
+
+    if timestamp_format is None:
+        if cache_key is not None and cache_key in FORMAT_CACHE:
+            timestamp_format = FORMAT_CACHE[cache_key]
+        else:
+            timestamp_format = detect_timestamp_format(values, sample_size)
+            if cache_key is not None:
+                FORMAT_CACHE[cache_key] = timestamp_format
+
+    # unparseable values become NaT and are counted instead of being dropped silently
+    timestamps = pd.to_datetime(values, format=timestamp_format, errors='coerce')
+    if timestamps.dtype == object:
+        # mixed utc offsets cannot share one dtype: normalized to utc
+        timestamps = pd.to_datetime(timestamps, utc=True)
+    return {
+        'timestamps': timestamps,
+        'format': timestamp_format,
+        'num_unparseable': int((timestamps.isna() & values.notna()).sum())
+    }
+
+def get_time_range_hours(timestamps: pd.Series) -> float:
+    """
+    params:
+    - timestamps: parsed timestamps
+    """
+
+    time_min, time_max = timestamps.min(), timestamps.max()
+    return (time_max - time_min).total_seconds() / 3600 if pd.notna(time_min) else 0
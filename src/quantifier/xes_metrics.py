@@ -1,15 +1,28 @@
 import pm4py
-import pandas as pd
+from dfg_metrics import compute_dfg
+from temporal_metrics import get_case_durations, describe_distribution
+from timestamp_parsing import parse_timestamps, get_time_range_hours
+from shared_tables import is_shared_table, attach_xes, flatten_list_attributes
 
 def get_xes_metrics(file_path):
     """
     params:
-    - file_path: XES file path
+    - file_path: XES file path (or directory of shared tables, see materialize_xes)
     """
 
-    log = pm4py.read_xes(file_path)
+    # shared tables are attached zero-copy instead of parsing the file again
+    if is_shared_table(file_path):
+        df = attach_xes(file_path)
+    else:
+        log = pm4py.read_xes(file_path)
+        df = flatten_list_attributes(pm4py.convert_to_dataframe(log))
 
-    df = pm4py.convert_to_dataframe(log)
+    # parsed once (pm4py already returns datetimes, strings are counted if unparseable)
+    parsed = parse_timestamps(df['time:timestamp'])
+    timestamps = parsed['timestamps']
+
+    # per-case durations and inter-event times from the sorted event table
+    durations = get_case_durations(df['case:concept:name'], timestamps)
  
     # extract statistics
     stats = {
@@ -20,10 +33,14 @@ def get_xes_metrics(file_path):
         'num_event_attributes': len([col for col in df.columns if not col.startswith('case:')]),
         'num_case_attributes': len([col for col in df.columns if col.startswith('case:')]),
         'avg_events_per_case': len(df) / df['case:concept:name'].nunique(),
-        'avg_case_duration_hours': pm4py.get_all_case_durations(log)[0] / 3600 if pm4py.get_all_case_durations(log) else 0,  
-        'time_range_hours': (pd.to_datetime(df['time:timestamp']) .max() - pd.to_datetime(df['time:timestamp']) .min()).total_seconds() / 3600,
+        'avg_case_duration_hours': float(durations['case_durations_hours'].mean()) if len(durations['case_durations_hours']) > 0 else 0,
+        'time_range_hours': get_time_range_hours(timestamps),
+        'num_unparseable_timestamps': parsed['num_unparseable'],
         'most_frequent_activity': df['concept:name'].mode().iloc[0] if not df.empty else None,
-        'most_active_resource': df['org:resource'].mode().iloc[0] if 'org:resource' in df.columns and not df.empty else None
+        'most_active_resource': df['org:resource'].mode().iloc[0] if 'org:resource' in df.columns and not df.empty else None,
+        'case_duration_distribution': describe_distribution(durations['case_durations_hours']),
+        'inter_event_time_distribution': describe_distribution(durations['inter_event_times_hours']),
+        'dfg': compute_dfg(df['case:concept:name'], df['concept:name'], timestamps)
     }
 
     # print function to be used if xes_metrics is used alone (not in a quantifier)
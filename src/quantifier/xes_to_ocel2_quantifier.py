@@ -1,125 +1,57 @@
-import numpy as np
 from typing import Dict
 from xes_metrics import get_xes_metrics
 from ocel2_metrics import get_ocel2_metrics
+from dfg_metrics import aggregate_dfg, compare_dfgs
+from temporal_metrics import distribution_similarity
+from lineage_metrics import load_lineage, get_lineage_metrics
+from concurrent_loader import load_concurrently, print_load_report
+from scoring_kernel import score_pair, xes_to_ocel2_subscores, XES_TO_OCEL2_DIMENSIONS, XES_TO_OCEL2_WEIGHTS, LINEAGE_SUBSCORES
 
-def xes_to_ocel2_quantifier(xes_file_path: str, ocel2_file_path: str):
+def xes_to_ocel2_quantifier(xes_file_path: str, ocel2_file_path: str, lineage_path=None, load_mode='process'):
     """
     params:
     - xes_file_path: XES file path
     - ocel2_file_path: OCEL2 file path
+    - lineage_path: lineage file written by xes_to_ocel2, enables exact event metrics (default: counts only)
+    - load_mode: loads both files concurrently ('process', 'thread') or one after the other ('serial') (default: 'process')
     """
 
-    xes_metrics = get_xes_metrics(xes_file_path)
-    ocel2_metrics = get_ocel2_metrics(ocel2_file_path)
-    quality_scores = {}
-    
-    # 1. information preservation metrics
-    
-    # event preservation
-    event_preservation = 1 - abs(1 - (ocel2_metrics['num_events'] / xes_metrics['num_events'])) if xes_metrics['num_events'] > 0 else 0
-    quality_scores['event_preservation'] = float(event_preservation)
-    
-    # activity preservation
-    activity_preservation = 1 - abs(1 - (ocel2_metrics['num_event_types'] / xes_metrics['num_activities'])) if xes_metrics['num_activities'] > 0 else 0
-    quality_scores['activity_preservation'] = float(activity_preservation)
-    
-    # temporal consistency
-    xes_range = xes_metrics['time_range_hours']
-    ocel2_range = ocel2_metrics['time_range_hours']
-    temporal_consistency = 1 - abs(xes_range - ocel2_range) / max(xes_range, ocel2_range) if max(xes_range, ocel2_range) > 0 else 1
-    quality_scores['temporal_consistency'] = float(temporal_consistency)
-    
-    # attribute preservation
-    xes_total_attrs = xes_metrics['num_event_attributes'] + xes_metrics['num_case_attributes']
-    ocel2_total_attrs = ocel2_metrics['num_event_attributes'] + ocel2_metrics['num_object_attributes']
-    attribute_preservation = 1 - abs(ocel2_total_attrs / xes_total_attrs) if xes_total_attrs > 0 else 1
-    quality_scores['attribute_preservation'] = float(attribute_preservation)
-    
-    information_score = np.mean([
-        quality_scores['event_preservation'],
-        quality_scores['activity_preservation'],
-        quality_scores['temporal_consistency'],
-        quality_scores['attribute_preservation']
-    ])
-    
+    # source and target are independent, parsing is gil bound
+    loaded, load_report = load_concurrently({
+        'xes': (get_xes_metrics, (xes_file_path,)),
+        'ocel2': (get_ocel2_metrics, (ocel2_file_path,))
+    }, load_mode)
+    xes_metrics, ocel2_metrics = loaded['xes'], loaded['ocel2']
 
-    # 2. object-centric enrichment metrics
+    precomputed = {}
 
-    # object discovery rate
-    # exception: at least cases and resources as objects
-    expected_objects = xes_metrics['num_cases'] + xes_metrics['num_resources']
-    actual_objects = ocel2_metrics['num_objects']
-    object_discovery_rate = min(actual_objects / expected_objects, 1.0) if expected_objects > 0 else 0
-    quality_scores['object_discovery_rate'] = float(object_discovery_rate)
-    
-    # e2o relationship discovery
-    # exception: at least e2o to case, e2o to resource (if available)
-    e2o_density = ocel2_metrics['avg_e2o_per_event']
-    expected_e2o = 2.0  # Case + Resource
-    e2o_quality = min(e2o_density / expected_e2o, 1.0)
-    quality_scores['e2o_density'] = float(e2o_quality)
-    
-    # object type diversity
-    # exception: at least case, resource (if available)
-    object_type_diversity = min(ocel2_metrics['num_object_types'] / 2, 1.0)
-    quality_scores['object_type_diversity'] = float(object_type_diversity)
-    
-    # o2o relationship discovery
-    o2o_quality = min(ocel2_metrics['num_o2o_relationships'] / ocel2_metrics['num_objects'], 1) if ocel2_metrics['num_objects'] > 0 else 0
-    quality_scores['o2o_discovery'] = float(o2o_quality)
+    # case duration and inter-event time distributions (cases vs. case objects)
+    precomputed['case_duration_similarity'] = distribution_similarity(
+        xes_metrics['case_duration_distribution'], ocel2_metrics['case_duration_distribution'])
+    precomputed['inter_event_time_similarity'] = distribution_similarity(
+        xes_metrics['inter_event_time_distribution'], ocel2_metrics['inter_event_time_distribution'])
 
-    # utilization of dynamic attributes
-    dynamic_utilization = min(ocel2_metrics['num_dynamic_changes'] / (ocel2_metrics['num_event_attributes'] + ocel2_metrics['num_object_attributes']), 0.1) * 10 \
-                        if max(ocel2_metrics['num_event_attributes'], ocel2_metrics['num_object_attributes']) > 0 else 1
-    quality_scores['dynamic_utilization'] = float(dynamic_utilization)
-    
-    enrichment_score = np.mean([
-        quality_scores['object_discovery_rate'],
-        quality_scores['e2o_density'],
-        quality_scores['object_type_diversity'],
-        quality_scores['o2o_discovery'],
-        quality_scores['dynamic_utilization']
-    ])
-    
-    # 3. structural integrity metrics
-    
-    # case coverage
-    case_objects = ocel2_metrics['num_objects'] - xes_metrics['num_resources']
-    case_coverage = 1 - abs(1 - (case_objects / xes_metrics['num_cases'])) if xes_metrics['num_cases'] > 0 else 0
-    quality_scores['case_coverage'] = float(case_coverage)
-    
-    # event distribution consistency 
-    # Vergleich der durchschnittlichen Events pro Case/Object
-    xes_avg_events = xes_metrics['avg_events_per_case']
-    ocel2_avg_events = ocel2_metrics['avg_events_per_object']
-    distribution_consistency = 1 - abs(xes_avg_events - ocel2_avg_events) / max(xes_avg_events, ocel2_avg_events) if max(xes_avg_events, ocel2_avg_events) > 0 else 1
-    quality_scores['distribution_consistency'] = float(distribution_consistency)
-    
-    structural_score = np.mean([
-        quality_scores['case_coverage'],
-        quality_scores['distribution_consistency']
-    ])
-    
-    # total score (weighted)
-    weights = {
-        'information_preservation': 0.30,
-        'object_enrichment': 0.40,
-        'structural_integrity': 0.30,
-    }
-    
-    dimension_scores = {
-        'information_preservation': information_score,
-        'object_enrichment': enrichment_score,
-        'structural_integrity': structural_score,
-    }
-    
-    total_score = sum(dimension_scores[dim] * weights[dim] for dim in dimension_scores)
+    # control-flow preservation (directly-follows graph of cases vs. case objects)
+    case_object_dfg = aggregate_dfg(ocel2_metrics['dfg'], [ocel2_metrics['primary_object_type']])
+    precomputed.update(compare_dfgs(xes_metrics['dfg'], case_object_dfg))
+
+    # exact event mapping instead of comparing counts
+    if lineage_path is not None:
+        lineage_metrics = get_lineage_metrics(load_lineage(lineage_path))
+        for name in LINEAGE_SUBSCORES:
+            precomputed[f"lineage:{name}"] = lineage_metrics[name]
+
+    # information preservation, object-centric enrichment and structural integrity (formulas in scoring_kernel)
+    scores = score_pair(xes_to_ocel2_subscores, XES_TO_OCEL2_DIMENSIONS, xes_metrics, ocel2_metrics, precomputed, XES_TO_OCEL2_WEIGHTS)
+    quality_scores = scores['subscores']
+    dimension_scores = scores['dimension_scores']
+    total_score = scores['total_score']
     
     result = {
         'total_score': total_score,
         'dimension_scores': {k: v for k, v in dimension_scores.items()},
-        'detailed_metrics': {k: v for k, v in quality_scores.items()}
+        'detailed_metrics': {k: v for k, v in quality_scores.items()},
+        'load_report': load_report
     }
     
     print_quality_report(result)
@@ -140,6 +72,8 @@ def print_quality_report(results: Dict):
     print("\nDETAILMETRIKEN:")
     for metric, value in results['detailed_metrics'].items():
         print(f"  {metric.replace('_', ' ').title()}: {value:.1%}")
+
+    print_load_report(results['load_report'])
     
     print(f"\nGESAMTBEWERTUNG: {results['total_score']:.3f}")
 
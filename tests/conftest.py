@@ -0,0 +1,12 @@
+import os
+import sys
+import pytest
+
+# the converter and quantifier scripts import each other as top-level modules
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(os.path.join(ROOT_DIR, 'src', 'converter'))
+sys.path.append(os.path.join(ROOT_DIR, 'src', 'quantifier'))
+
+@pytest.fixture
+def sample_dir():
+    return os.path.join(ROOT_DIR, 'data', 'sample_data')
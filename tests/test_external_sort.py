@@ -0,0 +1,17 @@
+import os
+import numpy as np
+import pytest
+from csv_to_xes import csv_to_xes
+from lineage_metrics import load_lineage
+
+@pytest.mark.parametrize('csv_file', ['csv_sample_simple.csv', 'csv_sample_simple2.csv', 'csv_sample_multi.csv', 'csv_sample_multi2.csv'])
+@pytest.mark.parametrize('chunk_size', [2, 5, 100000])
+def test_external_sort_matches_in_memory_output(sample_dir, tmp_path, csv_file, chunk_size):
+    csv_path = os.path.join(sample_dir, csv_file)
+    csv_to_xes(csv_path, str(tmp_path / 'memory.xes'), lineage_path=str(tmp_path / 'memory.npz'))
+    csv_to_xes(csv_path, str(tmp_path / 'external.xes'), lineage_path=str(tmp_path / 'external.npz'),
+               external_sort=True, chunk_size=chunk_size)
+
+    assert (tmp_path / 'external.xes').read_bytes() == (tmp_path / 'memory.xes').read_bytes()
+    np.testing.assert_array_equal(load_lineage(str(tmp_path / 'external.npz'))['event_source_index'],
+                                  load_lineage(str(tmp_path / 'memory.npz'))['event_source_index'])
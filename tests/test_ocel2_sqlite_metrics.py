@@ -0,0 +1,30 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from xes_to_ocel2 import xes_to_ocel2
+from ocel2_metrics import get_ocel2_metrics
+
+def assert_metrics_equal(expected, actual):
+    if isinstance(expected, dict):
+        assert expected.keys() == actual.keys()
+        for key in expected:
+            assert_metrics_equal(expected[key], actual[key])
+    elif isinstance(expected, pd.DataFrame):
+        # edge order depends on the backend
+        columns = list(expected.columns)
+        pd.testing.assert_frame_equal(expected.sort_values(columns).reset_index(drop=True),
+                                      actual.sort_values(columns).reset_index(drop=True))
+    elif isinstance(expected, (float, np.ndarray)):
+        np.testing.assert_allclose(expected, actual)
+    else:
+        assert expected == actual
+
+@pytest.mark.parametrize('xes_file', ['xes_sample.xes', 'xes_sample2.xes'])
+@pytest.mark.parametrize('enrich_objects', [False, True])
+def test_sqlite_metrics_match_json_metrics(sample_dir, tmp_path, xes_file, enrich_objects):
+    json_path, sqlite_path = str(tmp_path / 'log.json'), str(tmp_path / 'log.sqlite')
+    xes_to_ocel2(os.path.join(sample_dir, xes_file), json_path, enrich_objects=enrich_objects)
+    xes_to_ocel2(os.path.join(sample_dir, xes_file), sqlite_path, enrich_objects=enrich_objects)
+
+    assert_metrics_equal(get_ocel2_metrics(json_path), get_ocel2_metrics(sqlite_path))
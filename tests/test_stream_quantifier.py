@@ -0,0 +1,35 @@
+import os
+import numpy as np
+import pytest
+from csv_to_xes import csv_to_xes
+from xes_to_ocel2 import xes_to_ocel2
+from csv_metrics import get_csv_metrics
+from xes_metrics import get_xes_metrics
+from ocel2_metrics import get_ocel2_metrics
+from stream_quantifier import read_csv_stream, stream_quantifier
+
+@pytest.mark.parametrize('csv_file', ['csv_sample_simple.csv', 'csv_sample_simple2.csv', 'csv_sample_multi.csv', 'csv_sample_multi2.csv'])
+def test_stream_metrics_match_file_metrics(sample_dir, tmp_path, csv_file):
+    csv_path = os.path.join(sample_dir, csv_file)
+    csv_to_xes(csv_path, str(tmp_path / 'log.xes'))
+    xes_to_ocel2(str(tmp_path / 'log.xes'), str(tmp_path / 'log.json'))
+
+    *_, result = stream_quantifier(read_csv_stream(csv_path))
+
+    file_metrics = {
+        'csv': get_csv_metrics(csv_path)['stats'],
+        'xes': get_xes_metrics(str(tmp_path / 'log.xes')),
+        'ocel2': get_ocel2_metrics(str(tmp_path / 'log.json'))
+    }
+    for view, metrics in result['metrics'].items():
+        for key, value in metrics.items():
+            assert np.isclose(value, file_metrics[view][key]), f"{view}.{key}"
+
+def test_read_csv_stream_keeps_quoted_newlines(tmp_path):
+    csv_path = tmp_path / 'log.csv'
+    csv_path.write_text('case_id,activity,note\n1,A,"first\nsecond"\n\n2,B,\n', newline='')
+
+    assert list(read_csv_stream(str(csv_path))) == [
+        {'case_id': '1', 'activity': 'A', 'note': 'first\nsecond'},
+        {'case_id': '2', 'activity': 'B', 'note': None}
+    ]